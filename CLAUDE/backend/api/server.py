@@ -4,52 +4,102 @@ API Server Module
 FastAPI server providing REST API endpoints for CLAUDE application.
 """
 
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import multiprocessing
+from time import monotonic
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional
 from pathlib import Path
 import asyncio
 from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
-
-from ..core.llm.orchestrator import LLMOrchestrator, LLMResponse
-from ..core.rag.engine import RAGEngine, RAGQuery, RAGResult
-from ..core.indexing.code_indexer import CodeIndexer
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic.alias_generators import to_camel
+import orjson
+
+from ..core.llm.orchestrator import LLMOrchestrator, LLMResponse, close_shared_session
+from ..core.rag.engine import RAGEngine, RAGQuery, RetrievedCode
+from ..core.rag.response_cache import SemanticResponseCache
+from ..core.rag.embedding_cache import EmbeddingCache
+from ..core.indexing.code_indexer import CodeIndexer, lower_worker_priority
 from ..core.style.style_analyzer import CodeStyleAnalyzer
 from ..storage.vector.vector_db import VectorDatabaseManager
 from ..storage.storage_manager import StorageManager
 from ..monitoring.filewatch.file_watcher import MonitoringManager, FileChangeEvent
-from ..config.settings import settings
+from ..config.settings import settings, LOG_LEVEL, CODEBASE_ROOT
 
 # Configure logging
-logging.basicConfig(level=getattr(logging, settings.log_level))
+logging.basicConfig(level=LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 # Pydantic models for API
+# Request bodies accept both snake_case and the camelCase keys sent by the macOS client
+REQUEST_MODEL_CONFIG = ConfigDict(
+    extra="forbid",
+    str_strip_whitespace=True,
+    alias_generator=to_camel,
+    populate_by_name=True
+)
+
 class QueryRequest(BaseModel):
-    question: str = Field(..., description="User question or request")
-    language: Optional[str] = Field(None, description="Programming language context")
-    context_type: Optional[str] = Field(None, description="Type of context needed")
-    max_context_chunks: int = Field(5, description="Maximum context chunks to retrieve")
-    similarity_threshold: float = Field(0.3, description="Similarity threshold for retrieval")
+    model_config = REQUEST_MODEL_CONFIG
+    
+    question: str = Field(..., min_length=1, max_length=8192, description="User question or request")
+    language: Optional[str] = Field(None, max_length=64, description="Programming language context")
+    context_type: Optional[str] = Field(None, max_length=64, description="Type of context needed")
+    max_context_chunks: int = Field(5, ge=1, le=50, description="Maximum context chunks to retrieve")
+    similarity_threshold: float = Field(0.3, ge=0.0, le=1.0, description="Similarity threshold for retrieval")
+    stream: bool = Field(False, description="Stream the answer as NDJSON events")
 
 class IndexRequest(BaseModel):
-    directory_path: str = Field(..., description="Path to directory to index")
+    model_config = REQUEST_MODEL_CONFIG
+    
+    directory_path: str = Field(..., min_length=1, max_length=4096, description="Path to directory to index")
     recursive: bool = Field(True, description="Whether to index recursively")
-    file_patterns: Optional[List[str]] = Field(None, description="File patterns to include")
+    file_patterns: Optional[List[str]] = Field(None, max_length=100, description="File patterns to include")
 
 class CodeGenerationRequest(BaseModel):
-    problem_description: str = Field(..., description="Description of the problem to solve")
-    language: Optional[str] = Field(None, description="Target programming language")
-    framework: Optional[str] = Field(None, description="Target framework")
+    model_config = REQUEST_MODEL_CONFIG
+    
+    problem_description: str = Field(..., min_length=1, max_length=8192, description="Description of the problem to solve")
+    language: Optional[str] = Field(None, max_length=64, description="Target programming language")
+    framework: Optional[str] = Field(None, max_length=64, description="Target framework")
+    stream: bool = Field(False, description="Stream the generated code as NDJSON events")
 
 class StyleAnalysisRequest(BaseModel):
-    file_path: Optional[str] = Field(None, description="Specific file to analyze")
+    model_config = REQUEST_MODEL_CONFIG
+    
+    file_path: Optional[str] = Field(None, max_length=4096, description="Specific file to analyze")
     force_refresh: bool = Field(False, description="Force refresh of cached analysis")
 
+class AddWatchRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
+    directory_path: Path = Field(..., description="Directory to add to the watch list")
+    
+    @field_validator("directory_path")
+    @classmethod
+    def resolve_directory(cls, value: Path) -> Path:
+        """Normalize to an absolute path of an existing directory"""
+        if len(str(value)) > 4096:
+            raise ValueError("Path is too long")
+        
+        try:
+            resolved = value.expanduser().resolve(strict=True)
+        except OSError:
+            raise ValueError(f"Directory not found: {value}")
+        
+        if not resolved.is_dir():
+            raise ValueError(f"Not a directory: {value}")
+        
+        return resolved
+
 class MonitoringStatus(BaseModel):
     is_running: bool
     watched_directories: List[str]
@@ -62,22 +112,39 @@ class SystemStatus(BaseModel):
     uptime: float
     version: str
 
-# Global variables for components
-vector_db: Optional[VectorDatabaseManager] = None
-storage_manager: Optional[StorageManager] = None
-code_indexer: Optional[CodeIndexer] = None
-style_analyzer: Optional[CodeStyleAnalyzer] = None
-llm_orchestrator: Optional[LLMOrchestrator] = None
-rag_engine: Optional[RAGEngine] = None
-monitoring_manager: Optional[MonitoringManager] = None
+# Component dependencies
+
+def _component_dependency(name: str, display_name: str) -> Callable[[Request], Any]:
+    """Create a dependency that returns a component from app.state"""
+    def get_component(request: Request) -> Any:
+        component = getattr(request.app.state, name, None)
+        if component is None:
+            raise HTTPException(status_code=503, detail=f"{display_name} not initialized")
+        return component
+    
+    return get_component
+
+get_vector_db = _component_dependency("vector_db", "Vector database")
+get_storage_manager = _component_dependency("storage_manager", "Storage manager")
+get_code_indexer = _component_dependency("code_indexer", "Code indexer")
+get_style_analyzer = _component_dependency("style_analyzer", "Style analyzer")
+get_llm_orchestrator = _component_dependency("llm_orchestrator", "LLM orchestrator")
+get_rag_engine = _component_dependency("rag_engine", "RAG engine")
+get_response_cache = _component_dependency("response_cache", "Response cache")
+get_monitoring_manager = _component_dependency("monitoring_manager", "Monitoring manager")
+get_indexing_pool = _component_dependency("indexing_pool", "Indexing pool")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global vector_db, storage_manager, code_indexer, style_analyzer
-    global llm_orchestrator, rag_engine, monitoring_manager
-    
     logger.info("Starting CLAUDE API server...")
+    app.state.start_time = monotonic()
+    vector_db: Optional[VectorDatabaseManager] = None
+    llm_orchestrator: Optional[LLMOrchestrator] = None
+    monitoring_manager: Optional[MonitoringManager] = None
+    indexing_pool: Optional[ProcessPoolExecutor] = None
+    reindex_task: Optional[asyncio.Task] = None
+    monitoring_task: Optional[asyncio.Task] = None
     
     try:
         # Initialize components
@@ -85,29 +152,80 @@ async def lifespan(app: FastAPI):
         storage_manager = StorageManager()
         llm_orchestrator = LLMOrchestrator()
         
+        # Dedicated processes for CPU-bound parsing during directory indexing,
+        # run at the lowest CPU priority so they yield to request handling. They
+        # start from a fork server, since forking this process would copy it
+        # mid-flight with its threads and the embedding model
+        indexing_pool = ProcessPoolExecutor(
+            max_workers=settings.index_workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=lower_worker_priority
+        )
+        
         # Initialize core components
-        code_indexer = CodeIndexer(vector_db)
-        style_analyzer = CodeStyleAnalyzer(code_indexer, llm_orchestrator)
-        rag_engine = RAGEngine(code_indexer, style_analyzer, llm_orchestrator)
+        embedding_cache = EmbeddingCache(vector_db.embed_query)
+        code_indexer = CodeIndexer(vector_db, embedding_cache)
+        style_analyzer = CodeStyleAnalyzer(code_indexer, llm_orchestrator, indexing_pool)
+        response_cache = SemanticResponseCache()
+        rag_engine = RAGEngine(code_indexer, style_analyzer, llm_orchestrator, response_cache, embedding_cache)
         
         # Initialize monitoring
-        monitoring_manager = MonitoringManager(settings.watch_directories[0] if settings.watch_directories else ".")
-        
-        # Set up file change callback
-        async def handle_file_change(event: FileChangeEvent):
-            """Handle file change events"""
-            if event.event_type in ["modified", "created"]:
-                logger.info(f"Re-indexing modified file: {event.file_path}")
+        monitoring_manager = MonitoringManager(CODEBASE_ROOT)
+        
+        # Set up file change callback; changes are queued and re-indexed in batches
+        loop = asyncio.get_running_loop()
+        reindex_queue: asyncio.Queue = asyncio.Queue()
+        
+        def handle_file_change(event: FileChangeEvent):
+            """Handle file change events (called from the watcher thread)"""
+            loop.call_soon_threadsafe(reindex_queue.put_nowait, (event.file_path, event.timestamp))
+        
+        async def reindex_changed_files():
+            """Coalesce queued file changes and re-index them in one batch"""
+            while True:
+                file_path, timestamp = await reindex_queue.get()
+                pending = {file_path: timestamp}
+                
+                # Let bursts of saves settle, then drain everything queued meanwhile
+                await asyncio.sleep(settings.index_debounce_ms / 1000)
+                while not reindex_queue.empty():
+                    file_path, timestamp = reindex_queue.get_nowait()
+                    pending[file_path] = timestamp
+                
+                logger.info(f"Re-indexing {len(pending)} changed files")
                 try:
-                    await code_indexer.update_file_index(event.file_path)
+                    await code_indexer.update_files_index(list(pending))
                 except Exception as e:
-                    logger.error(f"Error re-indexing file {event.file_path}: {str(e)}")
+                    logger.error(f"Error re-indexing changed files: {str(e)}")
+                
+                # Cached answers may reference stale code
+                response_cache.invalidate()
         
+        reindex_task = asyncio.create_task(reindex_changed_files())
         monitoring_manager.add_change_callback(handle_file_change)
         
-        # Start monitoring if enabled
+        # Start monitoring if enabled; registering watches walks the whole tree, so
+        # it runs off the event loop while the rest of startup continues
         if settings.enable_file_watcher:
-            monitoring_manager.start_monitoring()
+            monitoring_task = asyncio.create_task(asyncio.to_thread(monitoring_manager.start_monitoring))
+        
+        # Expose components to endpoints through dependencies
+        app.state.vector_db = vector_db
+        app.state.storage_manager = storage_manager
+        app.state.code_indexer = code_indexer
+        app.state.style_analyzer = style_analyzer
+        app.state.llm_orchestrator = llm_orchestrator
+        app.state.rag_engine = rag_engine
+        app.state.response_cache = response_cache
+        app.state.embedding_cache = embedding_cache
+        app.state.monitoring_manager = monitoring_manager
+        app.state.indexing_pool = indexing_pool
+        
+        # Warm up the embedding model, vector index and LLM client before serving
+        await asyncio.to_thread(vector_db.warmup)
+        llm_orchestrator.ensure_client()
+        if monitoring_task:
+            await monitoring_task
         
         logger.info("CLAUDE API server initialized successfully")
         yield
@@ -118,10 +236,20 @@ async def lifespan(app: FastAPI):
     
     finally:
         # Cleanup
+        if reindex_task:
+            reindex_task.cancel()
+        if monitoring_task and not monitoring_task.done():
+            # The watcher thread can't be interrupted; let it finish before stopping it
+            await asyncio.wait([monitoring_task])
         if monitoring_manager:
             monitoring_manager.stop_monitoring()
         if vector_db:
             await vector_db.close()
+        if llm_orchestrator:
+            await llm_orchestrator.close()
+        await close_shared_session()
+        if indexing_pool:
+            indexing_pool.shutdown(wait=False, cancel_futures=True)
         logger.info("CLAUDE API server shutdown complete")
 
 # Create FastAPI app
@@ -129,18 +257,95 @@ app = FastAPI(
     title="CLAUDE API",
     description="Code-Library-Aware Unified Development Environment API",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Compress large responses such as retrieved code context
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=settings.cors_origins,
+    allow_credentials=False,
+    allow_methods=settings.cors_methods,
+    allow_headers=settings.cors_headers,
+    max_age=settings.cors_max_age,
 )
 
+# Response helpers
+
+CACHE_CONTROL = "max-age=5"
+
+def _content_etag(content: Any) -> str:
+    """Weak ETag hashed from the response content, so every process and restart agrees on it"""
+    digest = hashlib.sha256(orjson.dumps(content, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has this version"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+def _cacheable_response(content: Any, etag: Optional[str] = None) -> ORJSONResponse:
+    """JSON response with short-lived caching headers"""
+    headers = {"Cache-Control": CACHE_CONTROL}
+    if etag:
+        headers["ETag"] = etag
+    return ORJSONResponse(content, headers=headers)
+
+def _format_query_context(ctx: RetrievedCode) -> Dict[str, Any]:
+    """Serialize retrieved context for query responses"""
+    return {
+        "content": ctx.content,
+        "file_path": ctx.file_path,
+        "line_start": ctx.line_start,
+        "line_end": ctx.line_end,
+        "score": ctx.score,
+        "language": ctx.language,
+        "chunk_type": ctx.chunk_type
+    }
+
+def _format_generation_context(ctx: RetrievedCode) -> Dict[str, Any]:
+    """Serialize retrieved context for code generation responses"""
+    return {
+        "content": ctx.content,
+        "file_path": ctx.file_path,
+        "score": ctx.score
+    }
+
+async def _stream_rag_events(
+    events: AsyncIterator[Dict[str, Any]],
+    format_context: Callable[[RetrievedCode], Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """Serialize RAG stream events as NDJSON lines"""
+    try:
+        async for event in events:
+            if event["type"] == "context":
+                payload = {
+                    "type": "context",
+                    "retrieved_context": [format_context(ctx) for ctx in event["retrieved_context"]]
+                }
+            elif event["type"] == "done":
+                payload = {"type": "done", "metadata": event["result"].metadata}
+            else:
+                payload = event
+            
+            yield orjson.dumps(payload) + b"\n"
+            
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.error(f"Error streaming RAG response: {str(e)}")
+        yield orjson.dumps({"type": "error", "detail": str(e)}) + b"\n"
+
+@app.exception_handler(Exception)
+async def handle_unexpected_error(request: Request, exc: Exception) -> ORJSONResponse:
+    """Log unhandled endpoint errors and return them as 500 responses"""
+    logger.exception("Error handling request path=%s", request.url.path)
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
+
 # API Endpoints
 
 @app.get("/")
@@ -151,353 +356,278 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": asyncio.get_event_loop().time()}
+    return _cacheable_response({"status": "healthy", "timestamp": monotonic()})
 
 @app.post("/query", response_model=Dict[str, Any])
-async def query_rag(request: QueryRequest):
+async def query_rag(
+    request: QueryRequest,
+    rag_engine: RAGEngine = Depends(get_rag_engine)
+):
     """Execute RAG query"""
-    if not rag_engine:
-        raise HTTPException(status_code=503, detail="RAG engine not initialized")
+    query = RAGQuery(
+        question=request.question,
+        language=request.language,
+        context_type=request.context_type,
+        max_context_chunks=request.max_context_chunks,
+        similarity_threshold=request.similarity_threshold
+    )
     
-    try:
-        query = RAGQuery(
-            question=request.question,
-            language=request.language,
-            context_type=request.context_type,
-            max_context_chunks=request.max_context_chunks,
-            similarity_threshold=request.similarity_threshold
+    # The RAG engine answers repeated or similar questions from its response cache
+    if request.stream:
+        return StreamingResponse(
+            _stream_rag_events(rag_engine.query_stream(query), _format_query_context),
+            media_type="application/x-ndjson"
         )
-        
-        result = await rag_engine.query(query)
-        
-        return {
-            "answer": result.answer,
-            "retrieved_context": [
-                {
-                    "content": ctx.content,
-                    "file_path": ctx.file_path,
-                    "line_start": ctx.line_start,
-                    "line_end": ctx.line_end,
-                    "score": ctx.score,
-                    "language": ctx.language,
-                    "chunk_type": ctx.chunk_type
-                }
-                for ctx in result.retrieved_context
-            ],
-            "metadata": result.metadata
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in RAG query: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    result = await rag_engine.query(query)
+    
+    return {
+        "answer": result.answer,
+        "retrieved_context": [_format_query_context(ctx) for ctx in result.retrieved_context],
+        "metadata": result.metadata
+    }
 
 @app.post("/generate-code", response_model=Dict[str, Any])
-async def generate_code(request: CodeGenerationRequest):
+async def generate_code(
+    request: CodeGenerationRequest,
+    rag_engine: RAGEngine = Depends(get_rag_engine)
+):
     """Generate code with context awareness"""
-    if not rag_engine:
-        raise HTTPException(status_code=503, detail="RAG engine not initialized")
-    
-    try:
-        result = await rag_engine.generate_implementation(
+    if request.stream:
+        events = rag_engine.generate_implementation_stream(
             requirements=request.problem_description,
             language=request.language,
             framework=request.framework
         )
         
-        return {
-            "generated_code": result.answer,
-            "retrieved_context": [
-                {
-                    "content": ctx.content,
-                    "file_path": ctx.file_path,
-                    "score": ctx.score
-                }
-                for ctx in result.retrieved_context
-            ],
-            "metadata": result.metadata
-        }
-        
-    except Exception as e:
-        logger.error(f"Error generating code: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        return StreamingResponse(
+            _stream_rag_events(events, _format_generation_context),
+            media_type="application/x-ndjson"
+        )
+    
+    result = await rag_engine.generate_implementation(
+        requirements=request.problem_description,
+        language=request.language,
+        framework=request.framework
+    )
+    
+    return {
+        "generated_code": result.answer,
+        "retrieved_context": [_format_generation_context(ctx) for ctx in result.retrieved_context],
+        "metadata": result.metadata
+    }
 
 @app.post("/index/directory", response_model=Dict[str, Any])
-async def index_directory(request: IndexRequest, background_tasks: BackgroundTasks):
+async def index_directory(
+    request: IndexRequest,
+    background_tasks: BackgroundTasks,
+    code_indexer: CodeIndexer = Depends(get_code_indexer),
+    indexing_pool: Executor = Depends(get_indexing_pool),
+    response_cache: SemanticResponseCache = Depends(get_response_cache)
+):
     """Index a directory for code search"""
-    if not code_indexer:
-        raise HTTPException(status_code=503, detail="Code indexer not initialized")
+    # Run indexing in background, parsing files on the indexing process pool
+    async def run_indexing():
+        result = await code_indexer.index_directory(
+            request.directory_path,
+            request.recursive,
+            request.file_patterns,
+            executor=indexing_pool
+        )
+        logger.info(f"Directory indexing completed: {result}")
+        # Cached answers may reference stale code
+        response_cache.invalidate()
     
-    try:
-        # Run indexing in background
-        async def run_indexing():
-            result = await code_indexer.index_directory(
-                request.directory_path,
-                request.recursive,
-                request.file_patterns
-            )
-            logger.info(f"Directory indexing completed: {result}")
-        
-        background_tasks.add_task(run_indexing)
-        
-        return {
-            "message": "Directory indexing started",
-            "directory_path": request.directory_path,
-            "status": "processing"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error starting directory indexing: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    background_tasks.add_task(run_indexing)
+    
+    return {
+        "message": "Directory indexing started",
+        "directory_path": request.directory_path,
+        "status": "processing"
+    }
 
 @app.get("/index/stats")
-async def get_index_stats():
+async def get_index_stats(
+    request: Request,
+    code_indexer: CodeIndexer = Depends(get_code_indexer)
+):
     """Get indexing statistics"""
-    if not code_indexer:
-        raise HTTPException(status_code=503, detail="Code indexer not initialized")
+    stats = await asyncio.to_thread(code_indexer.get_index_stats)
     
-    try:
-        stats = code_indexer.get_index_stats()
-        return stats
-        
-    except Exception as e:
-        logger.error(f"Error getting index stats: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    etag = _content_etag(stats)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
+    return _cacheable_response(stats, etag)
 
 @app.post("/style/analyze", response_model=Dict[str, Any])
-async def analyze_style(request: StyleAnalysisRequest):
+async def analyze_style(
+    request: StyleAnalysisRequest,
+    style_analyzer: CodeStyleAnalyzer = Depends(get_style_analyzer)
+):
     """Analyze code style"""
-    if not style_analyzer:
-        raise HTTPException(status_code=503, detail="Style analyzer not initialized")
-    
-    try:
-        if request.file_path:
-            result = await style_analyzer.analyze_file_style(request.file_path)
-        else:
-            guidelines = await style_analyzer.analyze_codebase_style(request.force_refresh)
-            result = {
-                "guidelines": {
-                    "naming_conventions": guidelines.naming_conventions,
-                    "formatting_rules": guidelines.formatting_rules,
-                    "comment_style": guidelines.comment_style,
-                    "import_organization": guidelines.import_organization,
-                    "error_handling_patterns": guidelines.error_handling_patterns,
-                    "documentation_standards": guidelines.documentation_standards,
-                    "overall_style_profile": guidelines.overall_style_profile
-                }
+    if request.file_path:
+        result = await style_analyzer.analyze_file_style(request.file_path)
+    else:
+        guidelines = await style_analyzer.analyze_codebase_style(request.force_refresh)
+        result = {
+            "guidelines": {
+                "naming_conventions": guidelines.naming_conventions,
+                "formatting_rules": guidelines.formatting_rules,
+                "comment_style": guidelines.comment_style,
+                "import_organization": guidelines.import_organization,
+                "error_handling_patterns": guidelines.error_handling_patterns,
+                "documentation_standards": guidelines.documentation_standards,
+                "overall_style_profile": guidelines.overall_style_profile
             }
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error analyzing style: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        }
+    
+    return result
 
 @app.get("/style/guidelines")
-async def get_style_guidelines():
+async def get_style_guidelines(
+    request: Request,
+    style_analyzer: CodeStyleAnalyzer = Depends(get_style_analyzer)
+):
     """Get current style guidelines"""
-    if not style_analyzer:
-        raise HTTPException(status_code=503, detail="Style analyzer not initialized")
+    guidelines = await style_analyzer.get_style_guidelines()
     
-    try:
-        guidelines = await style_analyzer.get_style_guidelines()
-        return {"guidelines": guidelines}
-        
-    except Exception as e:
-        logger.error(f"Error getting style guidelines: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    etag = _content_etag(guidelines)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
+    return _cacheable_response({"guidelines": guidelines}, etag)
 
 @app.get("/monitoring/status")
-async def get_monitoring_status():
+async def get_monitoring_status(
+    monitoring_manager: MonitoringManager = Depends(get_monitoring_manager)
+):
     """Get monitoring status"""
-    if not monitoring_manager:
-        raise HTTPException(status_code=503, detail="Monitoring manager not initialized")
-    
-    try:
-        stats = monitoring_manager.get_monitoring_stats()
-        return stats
-        
-    except Exception as e:
-        logger.error(f"Error getting monitoring status: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    stats = await asyncio.to_thread(monitoring_manager.get_monitoring_stats)
+    return stats
 
 @app.post("/monitoring/start")
-async def start_monitoring():
+async def start_monitoring(
+    monitoring_manager: MonitoringManager = Depends(get_monitoring_manager)
+):
     """Start file monitoring"""
-    if not monitoring_manager:
-        raise HTTPException(status_code=503, detail="Monitoring manager not initialized")
-    
-    try:
-        monitoring_manager.start_monitoring()
-        return {"message": "Monitoring started"}
-        
-    except Exception as e:
-        logger.error(f"Error starting monitoring: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await asyncio.to_thread(monitoring_manager.start_monitoring)
+    return {"message": "Monitoring started"}
 
 @app.post("/monitoring/stop")
-async def stop_monitoring():
+async def stop_monitoring(
+    monitoring_manager: MonitoringManager = Depends(get_monitoring_manager)
+):
     """Stop file monitoring"""
-    if not monitoring_manager:
-        raise HTTPException(status_code=503, detail="Monitoring manager not initialized")
-    
-    try:
-        monitoring_manager.stop_monitoring()
-        return {"message": "Monitoring stopped"}
-        
-    except Exception as e:
-        logger.error(f"Error stopping monitoring: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await asyncio.to_thread(monitoring_manager.stop_monitoring)
+    return {"message": "Monitoring stopped"}
 
 @app.post("/monitoring/add-directory")
-async def add_watch_directory(directory_path: str):
+async def add_watch_directory(
+    request: AddWatchRequest,
+    monitoring_manager: MonitoringManager = Depends(get_monitoring_manager)
+):
     """Add directory to watch list"""
-    if not monitoring_manager:
-        raise HTTPException(status_code=503, detail="Monitoring manager not initialized")
-    
-    try:
-        monitoring_manager.add_watch_directory(directory_path)
-        return {"message": f"Added directory to watch list: {directory_path}"}
-        
-    except Exception as e:
-        logger.error(f"Error adding watch directory: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    directory_path = str(request.directory_path)
+    await asyncio.to_thread(monitoring_manager.add_watch_directory, directory_path)
+    return {"message": f"Added directory to watch list: {directory_path}"}
 
 @app.get("/storage/stats")
-async def get_storage_stats():
+async def get_storage_stats(storage_manager: StorageManager = Depends(get_storage_manager)):
     """Get storage statistics"""
-    if not storage_manager:
-        raise HTTPException(status_code=503, detail="Storage manager not initialized")
-    
-    try:
-        stats = await storage_manager.get_storage_stats()
-        return stats
-        
-    except Exception as e:
-        logger.error(f"Error getting storage stats: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    stats = await storage_manager.get_storage_stats()
+    return stats
 
 @app.post("/storage/backup")
-async def backup_storage(backup_path: str):
+async def backup_storage(
+    backup_path: str,
+    storage_manager: StorageManager = Depends(get_storage_manager)
+):
     """Create storage backup"""
-    if not storage_manager:
-        raise HTTPException(status_code=503, detail="Storage manager not initialized")
-    
-    try:
-        result = await storage_manager.backup_data(backup_path)
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error creating backup: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await storage_manager.backup_data(backup_path)
+    return result
 
 @app.post("/storage/restore")
-async def restore_storage(backup_path: str):
+async def restore_storage(
+    backup_path: str,
+    storage_manager: StorageManager = Depends(get_storage_manager)
+):
     """Restore storage from backup"""
-    if not storage_manager:
-        raise HTTPException(status_code=503, detail="Storage manager not initialized")
-    
-    try:
-        result = await storage_manager.restore_data(backup_path)
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error restoring from backup: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await storage_manager.restore_data(backup_path)
+    return result
 
 @app.get("/vector-db/stats")
-async def get_vector_db_stats():
+async def get_vector_db_stats(vector_db: VectorDatabaseManager = Depends(get_vector_db)):
     """Get vector database statistics"""
-    if not vector_db:
-        raise HTTPException(status_code=503, detail="Vector database not initialized")
-    
-    try:
-        stats = await vector_db.get_collection_stats()
-        return stats
-        
-    except Exception as e:
-        logger.error(f"Error getting vector DB stats: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    stats = await vector_db.get_collection_stats()
+    return stats
 
 @app.post("/vector-db/clear")
-async def clear_vector_db():
+async def clear_vector_db(
+    vector_db: VectorDatabaseManager = Depends(get_vector_db),
+    code_indexer: CodeIndexer = Depends(get_code_indexer),
+    response_cache: SemanticResponseCache = Depends(get_response_cache)
+):
     """Clear vector database"""
-    if not vector_db:
-        raise HTTPException(status_code=503, detail="Vector database not initialized")
-    
-    try:
-        result = await vector_db.clear_collection()
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error clearing vector DB: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await vector_db.clear_collection()
+    code_indexer.invalidate_search_cache()
+    response_cache.invalidate()
+    return result
 
 @app.get("/system/status")
-async def get_system_status():
+async def get_system_status(request: Request):
     """Get comprehensive system status"""
-    try:
-        components = {}
-        
-        # Check each component
-        components["vector_db"] = vector_db is not None
-        components["storage_manager"] = storage_manager is not None
-        components["code_indexer"] = code_indexer is not None
-        components["style_analyzer"] = style_analyzer is not None
-        components["llm_orchestrator"] = llm_orchestrator is not None
-        components["rag_engine"] = rag_engine is not None
-        components["monitoring_manager"] = monitoring_manager is not None
-        
-        # Check if monitoring is running
-        monitoring_active = False
-        if monitoring_manager:
-            monitoring_stats = monitoring_manager.get_monitoring_stats()
-            monitoring_active = monitoring_stats.get("file_watcher", {}).get("is_running", False)
-        
-        return {
-            "status": "healthy" if all(components.values()) else "degraded",
-            "components": components,
-            "monitoring_active": monitoring_active,
-            "version": "0.1.0",
-            "uptime": 0  # TODO: Track actual uptime
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting system status: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    state = request.app.state
+    components = {}
+    
+    # Check each component
+    for name in [
+        "vector_db", "storage_manager", "code_indexer", "style_analyzer",
+        "llm_orchestrator", "rag_engine", "monitoring_manager"
+    ]:
+        components[name] = getattr(state, name, None) is not None
+    
+    # Check if monitoring is running
+    monitoring_active = False
+    monitoring_manager = getattr(state, "monitoring_manager", None)
+    if monitoring_manager:
+        monitoring_stats = await asyncio.to_thread(monitoring_manager.get_monitoring_stats)
+        monitoring_active = monitoring_stats.get("file_watcher", {}).get("is_running", False)
+    
+    return {
+        "status": "healthy" if all(components.values()) else "degraded",
+        "components": components,
+        "monitoring_active": monitoring_active,
+        "version": "0.1.0",
+        "uptime": monotonic() - state.start_time
+    }
 
 @app.post("/llm/check-availability")
-async def check_llm_availability():
+async def check_llm_availability(
+    llm_orchestrator: LLMOrchestrator = Depends(get_llm_orchestrator)
+):
     """Check if LLM is available"""
-    if not llm_orchestrator:
-        raise HTTPException(status_code=503, detail="LLM orchestrator not initialized")
-    
-    try:
-        available = await llm_orchestrator.check_model_availability()
-        return {"available": available, "model": settings.llm_model}
-        
-    except Exception as e:
-        logger.error(f"Error checking LLM availability: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    available = await llm_orchestrator.check_model_availability()
+    return {"available": available, "model": settings.llm_model}
 
 @app.post("/llm/pull-model")
-async def pull_llm_model():
+async def pull_llm_model(llm_orchestrator: LLMOrchestrator = Depends(get_llm_orchestrator)):
     """Pull LLM model"""
-    if not llm_orchestrator:
-        raise HTTPException(status_code=503, detail="LLM orchestrator not initialized")
-    
-    try:
-        success = await llm_orchestrator.pull_model()
-        return {"success": success, "model": settings.llm_model}
-        
-    except Exception as e:
-        logger.error(f"Error pulling LLM model: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = await llm_orchestrator.pull_model()
+    return {"success": success, "model": settings.llm_model}
 
 if __name__ == "__main__":
     import uvicorn
+    # Components are created in lifespan, so each worker process would build its own
     uvicorn.run(
         "server:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=settings.api_reload
+        reload=settings.api_reload,
+        workers=1 if settings.api_reload else settings.api_workers,
+        loop=settings.api_loop,
+        http="httptools",
+        log_level=settings.log_level.lower()
     )
\ No newline at end of file
@@ -1,30 +1,77 @@
-from pydantic_settings import BaseSettings
-from typing import List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional, Tuple
+from functools import lru_cache
+import logging
 import os
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="CLAUDE_",
+        case_sensitive=False,
+        frozen=True
+    )
+    
     # LLM Configuration
     llm_model: str = "codellama:7b"
     ollama_base_url: str = "http://localhost:11434"
+    availability_cache_ttl: float = 10.0
+    llm_connection_limit: int = 32
+    llm_connections_per_host: int = 16
+    llm_keepalive_timeout: float = 300.0
     
     # Vector Database
     vector_db_path: str = "./data/vector_db"
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     
+    # Indexing
+    enable_parse_cache: bool = True
+    parse_cache_path: str = "./data/parse_cache.sqlite"
+    index_workers: int = max(1, (os.cpu_count() or 1) - 1)
+    index_chunksize: int = 16
+    index_embed_batch_size: int = 256
+    index_embed_concurrency: int = 4
+    search_cache_size: int = 1024
+    search_cache_ttl: float = 300.0
+    file_content_cache_size: int = 64
+    
+    # Style Analysis
+    enable_style_cache: bool = True
+    style_cache_path: str = "./data/style_cache.sqlite"
+    style_min_shard_size: int = 2000
+    
+    # Response Cache
+    response_cache_size: int = 10000
+    response_cache_ttl: float = 3600.0
+    response_cache_similarity: float = 0.95
+    embedding_cache_size: int = 50000
+    
     # Storage
     storage_type: str = "local"
     local_storage_path: str = "./data"
     cloud_storage_bucket: Optional[str] = None
+    storage_io_batch_size: int = 64
+    storage_io_concurrency: int = 8
+    storage_list_cache_ttl: float = 2.0
     
     # API Configuration
     api_host: str = "127.0.0.1"
     api_port: int = 8000
     api_reload: bool = True
+    # Indexer, watcher, caches and the parse pool live in each process, so
+    # extra workers would not share index state
+    api_workers: int = 1
+    api_loop: str = "uvloop"
+    cors_origins: Tuple[str, ...] = ("http://localhost:3000",)
+    cors_methods: Tuple[str, ...] = ("GET", "POST")
+    cors_headers: Tuple[str, ...] = ("content-type", "authorization")
+    cors_max_age: int = 600
     
     # Monitoring
     enable_file_watcher: bool = True
-    watch_directories: List[str] = ["./test_codebase"]
+    watch_directories: Tuple[str, ...] = ("./test_codebase",)
     git_integration: bool = True
+    index_debounce_ms: int = 500
     
     # Fine-tuning
     enable_finetuning: bool = False
@@ -34,8 +81,14 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
     log_file: str = "./logs/claude.log"
-    
-    class Config:
-        env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process"""
+    return Settings()
+
+settings = get_settings()
+
+# Derived values computed once at import
+LOG_LEVEL = getattr(logging, settings.log_level.upper(), logging.INFO)
+CODEBASE_ROOT = settings.watch_directories[0] if settings.watch_directories else "."
\ No newline at end of file
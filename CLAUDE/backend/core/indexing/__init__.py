@@ -4,6 +4,11 @@ Indexing Module
 Provides code parsing, chunking, and indexing capabilities for RAG functionality.
 """
 
-from .code_indexer import CodeIndexer, CodeChunk, FileIndex, CodeParser
+from .code_indexer import CodeIndexer, CodeChunk, FileIndex, CodeParser, lower_worker_priority
+from .parse_cache import ParseCache, get_parse_cache
+from .tree_sitter_parser import TreeSitterParser, get_tree_sitter_parser, TREE_SITTER_AVAILABLE
 
-__all__ = ["CodeIndexer", "CodeChunk", "FileIndex", "CodeParser"]
\ No newline at end of file
+__all__ = [
+    "CodeIndexer", "CodeChunk", "FileIndex", "CodeParser", "lower_worker_priority", "ParseCache", "get_parse_cache",
+    "TreeSitterParser", "get_tree_sitter_parser", "TREE_SITTER_AVAILABLE"
+]
\ No newline at end of file
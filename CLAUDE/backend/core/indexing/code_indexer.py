@@ -8,19 +8,59 @@ This module processes code files and creates searchable embeddings.
 import os
 import re
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
 import asyncio
 import ast
+import bisect
+import fnmatch
+import hashlib
 import json
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
 
+import orjson
+
+from .parse_cache import ParseCache, get_parse_cache
+from .tree_sitter_parser import get_tree_sitter_parser
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+_NEWLINE_RE = re.compile('\n')
+
+# Directories that never contain indexable sources
+_SKIPPED_DIRECTORIES = frozenset({'.git', 'node_modules', '__pycache__'})
+
+@lru_cache(maxsize=4096)
+def _chunk_id_prefix(file_path: str) -> str:
+    """Get the chunk ID prefix for a file; the path hash keeps same-named files apart"""
+    path_hash = hashlib.sha1(file_path.encode('utf-8')).hexdigest()[:8]
+    return f"{Path(file_path).stem}_{path_hash}"
+
+def lower_worker_priority():
+    """Pool initializer giving an indexing worker process the lowest CPU priority, so it yields to request handling"""
+    try:
+        os.nice(19)
+    except (OSError, AttributeError) as e:
+        logger.debug("Could not lower indexing worker priority: %s", e)
+        return
+    
+    # Linux only; nice 19 alone still takes a share of a busy CPU
+    try:
+        os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    except (OSError, AttributeError) as e:
+        logger.debug("Could not set idle scheduling for indexing worker: %s", e)
+
+# Simple function/class detection for non-Python files; [^\S\n] keeps matches within a line
+_FUNCTION_RE = re.compile(r'function[^\S\n]+(\w+)|def[^\S\n]+(\w+)|\b\w+[^\S\n]+(\w+)[^\S\n]*\([^)\n]*\)[^\S\n]*{')
+_CLASS_RE = re.compile(r'class[^\S\n]+(\w+)|interface[^\S\n]+(\w+)|struct[^\S\n]+(\w+)')
+
+@dataclass(slots=True)
 class CodeChunk:
     """Represents a chunk of code with metadata"""
     content: str
@@ -30,13 +70,9 @@ class CodeChunk:
     language: str
     chunk_type: str  # "function", "class", "import", "variable", "comment"
     name: Optional[str] = None
-    dependencies: List[str] = None
-    
-    def __post_init__(self):
-        if self.dependencies is None:
-            self.dependencies = []
+    dependencies: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class FileIndex:
     """Index information for a file"""
     file_path: str
@@ -45,6 +81,82 @@ class FileIndex:
     chunks: List[CodeChunk]
     total_chunks: int
     file_size: int
+    content_hash: Optional[str] = None
+    chunk_ids: List[str] = field(default_factory=list)
+
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+class PythonChunkVisitor(ast.NodeVisitor):
+    """Extracts code chunks from a Python module in a single AST pass"""
+    
+    # Node type -> visit method, shared by all instances
+    _dispatch: Dict[type, Any] = {}
+    
+    def __init__(self, content: str, line_starts: List[int], file_path: str):
+        self.content = content
+        self.line_starts = line_starts
+        self.file_path = file_path
+        self.chunks: List[CodeChunk] = []
+        # Names loaded inside each enclosing function, innermost last
+        self._dependencies: List[Set[str]] = []
+    
+    def visit(self, node):
+        # Cache the method lookup NodeVisitor.visit repeats for every node
+        method = self._dispatch.get(type(node))
+        if method is None:
+            method = getattr(type(self), 'visit_' + type(node).__name__, type(self).generic_visit)
+            self._dispatch[type(node)] = method
+        return method(self, node)
+    
+    def generic_visit(self, node):
+        if self._dependencies:
+            for child in ast.iter_child_nodes(node):
+                self.visit(child)
+        else:
+            # Outside functions only statements can hold definitions or imports,
+            # and names aren't collected, so expressions can be skipped
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, _STATEMENT_NODES):
+                    self.visit(child)
+    
+    def visit_FunctionDef(self, node):
+        chunk = CodeParser._extract_function_chunk(node, self.content, self.line_starts, self.file_path)
+        if chunk:
+            self.chunks.append(chunk)
+        
+        self._dependencies.append(set())
+        self.generic_visit(node)
+        dependencies = self._dependencies.pop()
+        
+        # Nested function names also count as dependencies of the enclosing function
+        if self._dependencies:
+            self._dependencies[-1] |= dependencies
+        
+        if chunk:
+            chunk.dependencies = list(dependencies)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node):
+        chunk = CodeParser._extract_class_chunk(node, self.content, self.line_starts, self.file_path)
+        if chunk:
+            self.chunks.append(chunk)
+        
+        self.generic_visit(node)
+    
+    def visit_Import(self, node):
+        chunk = CodeParser._extract_import_chunk(node, self.content, self.line_starts, self.file_path)
+        if chunk:
+            self.chunks.append(chunk)
+    
+    def visit_ImportFrom(self, node):
+        chunk = CodeParser._extract_import_from_chunk(node, self.content, self.line_starts, self.file_path)
+        if chunk:
+            self.chunks.append(chunk)
+    
+    def visit_Name(self, node):
+        if self._dependencies and type(node.ctx) is ast.Load:
+            self._dependencies[-1].add(node.id)
 
 class CodeParser:
     """Parses code files and extracts structured information"""
@@ -70,7 +182,7 @@ class CodeParser:
     @classmethod
     def get_language(cls, file_path: str) -> Optional[str]:
         """Detect programming language from file extension"""
-        ext = Path(file_path).suffix.lower()
+        ext = os.path.splitext(file_path)[1].lower()
         return cls.SUPPORTED_LANGUAGES.get(ext)
     
     @classmethod
@@ -81,48 +193,75 @@ class CodeParser:
             return []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            parse_cache = get_parse_cache()
+            cache_key = None
+            
+            with open(file_path, 'rb') as f:
+                # Reuse chunks from a previous run when the content is unchanged;
+                # hits are served without reading the file into memory
+                if parse_cache:
+                    try:
+                        cache_key = parse_cache.make_key(file_path, parse_cache.file_digest(f))
+                        cached_chunks = parse_cache.get(cache_key)
+                        if cached_chunks is not None:
+                            return cached_chunks
+                    except Exception as e:
+                        logger.warning(f"Error reading parse cache for {file_path}: {str(e)}")
+                
+                data = f.read()
+            
+            # Match text-mode reads, which translate line endings to '\n'
+            content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
             
             if language == 'python':
-                return cls._parse_python_file(file_path, content)
+                chunks = cls._parse_python_file(file_path, content)
             else:
-                return cls._parse_generic_file(file_path, content, language)
+                chunks = cls._parse_structured_file(file_path, content, language)
+                if chunks is None:
+                    chunks = cls._parse_generic_file(file_path, content, language)
+            
+            if parse_cache and cache_key:
+                try:
+                    parse_cache.put(cache_key, chunks)
+                except Exception as e:
+                    logger.warning(f"Error writing parse cache for {file_path}: {str(e)}")
+            
+            return chunks
                 
         except Exception as e:
             logger.error(f"Error parsing file {file_path}: {str(e)}")
             return []
     
+    @staticmethod
+    def _line_starts(content: str) -> List[int]:
+        """Get the offset in content where each line starts"""
+        line_starts = [0]
+        line_starts.extend(match.end() for match in _NEWLINE_RE.finditer(content))
+        return line_starts
+    
+    @staticmethod
+    def _slice_lines(content: str, line_starts: List[int], start_line: int, end_line: int) -> str:
+        """Get 0-based lines [start_line, end_line) as a single slice of content, without the final newline"""
+        end = line_starts[end_line] - 1 if end_line < len(line_starts) else len(content)
+        return content[line_starts[start_line]:end]
+    
+    @classmethod
+    def parse_files(cls, file_paths: List[str]) -> List[List[CodeChunk]]:
+        """Parse a batch of files, e.g. as one process pool task"""
+        return [cls.parse_file(file_path) for file_path in file_paths]
+    
     @classmethod
     def _parse_python_file(cls, file_path: str, content: str) -> List[CodeChunk]:
         """Parse Python file using AST"""
-        chunks = []
-        lines = content.split('\n')
+        line_starts = cls._line_starts(content)
         
         try:
             tree = ast.parse(content)
             
-            # Extract functions
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    chunk = cls._extract_function_chunk(node, lines, file_path)
-                    if chunk:
-                        chunks.append(chunk)
-                
-                elif isinstance(node, ast.ClassDef):
-                    chunk = cls._extract_class_chunk(node, lines, file_path)
-                    if chunk:
-                        chunks.append(chunk)
-                
-                elif isinstance(node, ast.Import):
-                    chunk = cls._extract_import_chunk(node, lines, file_path)
-                    if chunk:
-                        chunks.append(chunk)
-                
-                elif isinstance(node, ast.ImportFrom):
-                    chunk = cls._extract_import_from_chunk(node, lines, file_path)
-                    if chunk:
-                        chunks.append(chunk)
+            # Extract functions, classes and imports in one traversal
+            visitor = PythonChunkVisitor(content, line_starts, file_path)
+            visitor.visit(tree)
+            chunks = visitor.chunks
         
         except SyntaxError:
             # Fallback to generic parsing if syntax error
@@ -134,7 +273,7 @@ class CodeParser:
                 content=content,
                 file_path=file_path,
                 line_start=1,
-                line_end=len(lines),
+                line_end=len(line_starts),
                 language='python',
                 chunk_type='file'
             ))
@@ -142,45 +281,34 @@ class CodeParser:
         return chunks
     
     @classmethod
-    def _extract_function_chunk(cls, node: ast.FunctionDef, lines: List[str], file_path: str) -> Optional[CodeChunk]:
-        """Extract function chunk"""
+    def _extract_function_chunk(cls, node: ast.FunctionDef, content: str, line_starts: List[int], file_path: str) -> Optional[CodeChunk]:
+        """Extract function chunk; dependencies are filled in by PythonChunkVisitor"""
         try:
             start_line = node.lineno - 1  # Convert to 0-based
-            end_line = node.end_lineno if node.end_lineno else len(lines)
-            
-            content = '\n'.join(lines[start_line:end_line])
-            
-            # Extract dependencies
-            dependencies = []
-            for child in ast.walk(node):
-                if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
-                    dependencies.append(child.id)
+            end_line = node.end_lineno if node.end_lineno else len(line_starts)
             
             return CodeChunk(
-                content=content,
+                content=cls._slice_lines(content, line_starts, start_line, end_line),
                 file_path=file_path,
                 line_start=start_line + 1,
                 line_end=end_line,
                 language='python',
                 chunk_type='function',
-                name=node.name,
-                dependencies=list(set(dependencies))
+                name=node.name
             )
         except Exception as e:
             logger.error(f"Error extracting function chunk: {str(e)}")
             return None
     
     @classmethod
-    def _extract_class_chunk(cls, node: ast.ClassDef, lines: List[str], file_path: str) -> Optional[CodeChunk]:
+    def _extract_class_chunk(cls, node: ast.ClassDef, content: str, line_starts: List[int], file_path: str) -> Optional[CodeChunk]:
         """Extract class chunk"""
         try:
             start_line = node.lineno - 1
-            end_line = node.end_lineno if node.end_lineno else len(lines)
-            
-            content = '\n'.join(lines[start_line:end_line])
+            end_line = node.end_lineno if node.end_lineno else len(line_starts)
             
             return CodeChunk(
-                content=content,
+                content=cls._slice_lines(content, line_starts, start_line, end_line),
                 file_path=file_path,
                 line_start=start_line + 1,
                 line_end=end_line,
@@ -193,10 +321,10 @@ class CodeParser:
             return None
     
     @classmethod
-    def _extract_import_chunk(cls, node: ast.Import, lines: List[str], file_path: str) -> Optional[CodeChunk]:
+    def _extract_import_chunk(cls, node: ast.Import, content: str, line_starts: List[int], file_path: str) -> Optional[CodeChunk]:
         """Extract import chunk"""
         try:
-            line = lines[node.lineno - 1]
+            line = cls._slice_lines(content, line_starts, node.lineno - 1, node.lineno)
             
             return CodeChunk(
                 content=line.strip(),
@@ -211,10 +339,10 @@ class CodeParser:
             return None
     
     @classmethod
-    def _extract_import_from_chunk(cls, node: ast.ImportFrom, lines: List[str], file_path: str) -> Optional[CodeChunk]:
+    def _extract_import_from_chunk(cls, node: ast.ImportFrom, content: str, line_starts: List[int], file_path: str) -> Optional[CodeChunk]:
         """Extract import from chunk"""
         try:
-            line = lines[node.lineno - 1]
+            line = cls._slice_lines(content, line_starts, node.lineno - 1, node.lineno)
             
             return CodeChunk(
                 content=line.strip(),
@@ -228,48 +356,68 @@ class CodeParser:
             logger.error(f"Error extracting import from chunk: {str(e)}")
             return None
     
+    @classmethod
+    def _parse_structured_file(cls, file_path: str, content: str, language: str) -> Optional[List[CodeChunk]]:
+        """Parse non-Python file with tree-sitter; returns None when no grammar is available"""
+        definitions = get_tree_sitter_parser().find_definitions(file_path, content.encode('utf-8'), language)
+        if definitions is None:
+            return None
+        
+        line_starts = cls._line_starts(content)
+        chunks = [
+            CodeChunk(
+                content=cls._slice_lines(content, line_starts, line_start - 1, line_end),
+                file_path=file_path,
+                line_start=line_start,
+                line_end=line_end,
+                language=language,
+                chunk_type=chunk_type,
+                name=name
+            )
+            for line_start, line_end, chunk_type, name in definitions
+        ]
+        
+        # If no definitions found, create file-level chunk
+        if not chunks:
+            chunks.append(CodeChunk(
+                content=content,
+                file_path=file_path,
+                line_start=1,
+                line_end=len(line_starts),
+                language=language,
+                chunk_type='file'
+            ))
+        
+        return chunks
+    
     @classmethod
     def _parse_generic_file(cls, file_path: str, content: str, language: str) -> List[CodeChunk]:
         """Parse file using generic method for non-Python files"""
         chunks = []
-        lines = content.split('\n')
+        line_starts = cls._line_starts(content)
         
-        # Simple function/class detection using regex
-        function_pattern = r'function\s+(\w+)|def\s+(\w+)|\w+\s+(\w+)\s*\([^)]*\)\s*{'
-        class_pattern = r'class\s+(\w+)|interface\s+(\w+)|struct\s+(\w+)'
+        # Scan the whole content once per pattern, keeping the first match on each line
+        matches = []
+        for order, (chunk_type, pattern) in enumerate((('function', _FUNCTION_RE), ('class', _CLASS_RE))):
+            last_line = -1
+            for match in pattern.finditer(content):
+                line = bisect.bisect_right(line_starts, match.start()) - 1
+                if line != last_line:
+                    matches.append((line, order, chunk_type, next(g for g in match.groups() if g)))
+                    last_line = line
         
-        for i, line in enumerate(lines):
-            line_content = line.strip()
-            if not line_content:
-                continue
-            
-            # Check for function definition
-            func_match = re.search(function_pattern, line_content)
-            if func_match:
-                func_name = next(g for g in func_match.groups() if g)
-                chunks.append(CodeChunk(
-                    content=line_content,
-                    file_path=file_path,
-                    line_start=i + 1,
-                    line_end=i + 1,
-                    language=language,
-                    chunk_type='function',
-                    name=func_name
-                ))
-            
-            # Check for class definition
-            class_match = re.search(class_pattern, line_content)
-            if class_match:
-                class_name = next(g for g in class_match.groups() if g)
-                chunks.append(CodeChunk(
-                    content=line_content,
-                    file_path=file_path,
-                    line_start=i + 1,
-                    line_end=i + 1,
-                    language=language,
-                    chunk_type='class',
-                    name=class_name
-                ))
+        matches.sort(key=lambda m: (m[0], m[1]))
+        
+        for line, _, chunk_type, name in matches:
+            chunks.append(CodeChunk(
+                content=cls._slice_lines(content, line_starts, line, line + 1).strip(),
+                file_path=file_path,
+                line_start=line + 1,
+                line_end=line + 1,
+                language=language,
+                chunk_type=chunk_type,
+                name=name
+            ))
         
         # If no structured chunks found, create file-level chunk
         if not chunks:
@@ -277,7 +425,7 @@ class CodeParser:
                 content=content,
                 file_path=file_path,
                 line_start=1,
-                line_end=len(lines),
+                line_end=len(line_starts),
                 language=language,
                 chunk_type='file'
             ))
@@ -287,18 +435,33 @@ class CodeParser:
 class CodeIndexer:
     """Main code indexing class"""
     
-    def __init__(self, vector_db_manager):
+    def __init__(self, vector_db_manager, embedding_cache=None):
         self.vector_db_manager = vector_db_manager
+        self.embedding_cache = embedding_cache
         self.parser = CodeParser()
         self.indexed_files: Dict[str, FileIndex] = {}
         
+        # (query, k, threshold, index_version) -> (expires_at, results)
+        self._search_cache: "OrderedDict[Tuple[str, int, float, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._index_version = 0
+        # file_path -> ((mtime_ns, size), content) of recently read files
+        self._content_cache: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+        
     async def index_directory(
         self,
         directory_path: str,
         recursive: bool = True,
-        file_patterns: Optional[List[str]] = None
+        file_patterns: Optional[List[str]] = None,
+        executor: Optional[Executor] = None
     ) -> Dict[str, Any]:
-        """Index all code files in a directory"""
+        """
+        Index all code files in a directory
+        
+        Parsing is CPU-bound and holds the GIL, so files are parsed on the
+        given executor or on a temporary process pool when none is provided.
+        Chunks are embedded in batches as parse results arrive, overlapping
+        parsing with embedding.
+        """
         try:
             directory = Path(directory_path)
             if not directory.exists():
@@ -308,46 +471,108 @@ class CodeIndexer:
             code_files = self._find_code_files(directory, recursive, file_patterns)
             
             # Parse files in parallel
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                loop = asyncio.get_event_loop()
-                tasks = []
+            loop = asyncio.get_running_loop()
+            owns_executor = executor is None
+            if owns_executor:
+                # Forking the running, multithreaded server would copy its held locks
+                executor = ProcessPoolExecutor(
+                    max_workers=settings.index_workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                    initializer=lower_worker_priority
+                )
+            
+            file_paths = [str(file_path) for file_path in code_files]
+            batch_size = settings.index_chunksize
+            
+            # Hashes let later updates skip files whose content is unchanged;
+            # they are computed in a thread while the files are parsed
+            file_states_task = asyncio.create_task(asyncio.to_thread(self._get_file_states, file_paths))
+            
+            async def parse_batch(batch: List[str]) -> Tuple[List[str], List[List[CodeChunk]]]:
+                # CodeParser.parse_files is a classmethod, so it pickles for process pools
+                return batch, await loop.run_in_executor(executor, CodeParser.parse_files, batch)
+            
+            embed_semaphore = asyncio.Semaphore(settings.index_embed_concurrency)
+            
+            async def store_batch(chunks: List[CodeChunk]) -> Dict[str, List[str]]:
+                async with embed_semaphore:
+                    return await self._store_chunks_in_vector_db(chunks)
+            
+            file_chunks: Dict[str, List[CodeChunk]] = {}
+            pending_chunks: List[CodeChunk] = []
+            store_tasks = []
+            
+            try:
+                parse_tasks = [
+                    parse_batch(file_paths[i:i + batch_size])
+                    for i in range(0, len(file_paths), batch_size)
+                ]
                 
-                for file_path in code_files:
-                    task = loop.run_in_executor(executor, self.parser.parse_file, str(file_path))
-                    tasks.append(task)
+                # Embed chunks while remaining files are still being parsed
+                for parse_task in asyncio.as_completed(parse_tasks):
+                    batch, chunks_list = await parse_task
+                    for file_path, chunks in zip(batch, chunks_list):
+                        file_chunks[file_path] = chunks
+                        # A file's chunks stay in one store call so their IDs are numbered together
+                        pending_chunks.extend(chunks)
+                    
+                    if len(pending_chunks) >= settings.index_embed_batch_size:
+                        store_tasks.append(asyncio.create_task(store_batch(pending_chunks)))
+                        pending_chunks = []
                 
-                chunks_list = await asyncio.gather(*tasks)
-            
-            # Flatten chunks and create embeddings
-            all_chunks = []
-            for chunks in chunks_list:
-                all_chunks.extend(chunks)
+                if pending_chunks:
+                    store_tasks.append(asyncio.create_task(store_batch(pending_chunks)))
+                
+                chunk_ids: Dict[str, List[str]] = {}
+                for batch_ids in await asyncio.gather(*store_tasks):
+                    chunk_ids.update(batch_ids)
+            finally:
+                if owns_executor:
+                    executor.shutdown(wait=False)
             
-            # Create embeddings and store in vector database
-            if all_chunks:
-                await self._store_chunks_in_vector_db(all_chunks)
+            all_chunks_count = sum(len(chunks) for chunks in file_chunks.values())
             
             # Update file index
-            for i, file_path in enumerate(code_files):
-                chunks = chunks_list[i]
-                file_stat = os.stat(str(file_path))
+            file_states = await file_states_task
+            languages = set()
+            orphaned_ids = []
+            for file_path in file_paths:
+                # Files that disappeared while indexing are left out; their chunks
+                # were already stored, so they are deleted along with any older index
+                if file_path not in file_states:
+                    orphaned_ids.extend(chunk_ids.get(file_path, []))
+                    old_index = self.indexed_files.pop(file_path, None)
+                    if old_index:
+                        orphaned_ids.extend(old_index.chunk_ids)
+                    continue
                 
-                self.indexed_files[str(file_path)] = FileIndex(
-                    file_path=str(file_path),
-                    language=self.parser.get_language(str(file_path)) or 'unknown',
+                chunks = file_chunks[file_path]
+                file_stat, content_hash = file_states[file_path]
+                
+                language = self.parser.get_language(file_path)
+                if language:
+                    languages.add(language)
+                
+                self.indexed_files[file_path] = FileIndex(
+                    file_path=file_path,
+                    language=language or 'unknown',
                     last_modified=file_stat.st_mtime,
                     chunks=chunks,
                     total_chunks=len(chunks),
-                    file_size=file_stat.st_size
+                    file_size=file_stat.st_size,
+                    content_hash=content_hash,
+                    chunk_ids=chunk_ids.get(file_path, [])
                 )
             
+            if orphaned_ids:
+                # Chunk IDs are derived from the path, so old and new ones can repeat
+                await self.vector_db_manager.delete_documents(list(dict.fromkeys(orphaned_ids)))
+                self.invalidate_search_cache()
+            
             return {
                 "indexed_files": len(code_files),
-                "total_chunks": len(all_chunks),
-                "languages": list(set(
-                    self.parser.get_language(str(f)) for f in code_files
-                    if self.parser.get_language(str(f))
-                ))
+                "total_chunks": all_chunks_count,
+                "languages": list(languages)
             }
             
         except Exception as e:
@@ -360,32 +585,41 @@ class CodeIndexer:
         recursive: bool,
         file_patterns: Optional[List[str]]
     ) -> List[Path]:
-        """Find all code files in directory"""
+        """Find all code files in directory with a single scandir walk"""
         code_files = []
+        extensions = set(self.parser.SUPPORTED_LANGUAGES.keys())
+        directories = [str(directory)]
         
-        if file_patterns:
-            patterns = file_patterns
-        else:
-            patterns = [f"*{ext}" for ext in self.parser.SUPPORTED_LANGUAGES.keys()]
-        
-        for pattern in patterns:
-            if recursive:
-                code_files.extend(directory.rglob(pattern))
-            else:
-                code_files.extend(directory.glob(pattern))
+        while directories:
+            try:
+                with os.scandir(directories.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and entry.name not in _SKIPPED_DIRECTORIES:
+                                directories.append(entry.path)
+                        elif file_patterns:
+                            if any(fnmatch.fnmatchcase(entry.name, pattern) for pattern in file_patterns):
+                                code_files.append(Path(entry.path))
+                        elif os.path.splitext(entry.name)[1].lower() in extensions:
+                            code_files.append(Path(entry.path))
+            except OSError as e:
+                logger.warning(f"Error scanning directory: {str(e)}")
         
-        # Remove duplicates and sort
-        return sorted(list(set(code_files)))
+        return sorted(code_files)
     
-    async def _store_chunks_in_vector_db(self, chunks: List[CodeChunk]):
-        """Store chunks in vector database with embeddings"""
+    async def _store_chunks_in_vector_db(self, chunks: List[CodeChunk]) -> Dict[str, List[str]]:
+        """Store chunks in vector database with embeddings, returning the chunk IDs per file"""
         try:
             # Prepare documents for vector database
             documents = []
             metadatas = []
             ids = []
+            file_chunk_ids: Dict[str, List[str]] = {}
             
-            for i, chunk in enumerate(chunks):
+            for chunk in chunks:
+                # Number chunks per file; the IDs are kept on the FileIndex
+                chunk_ids = file_chunk_ids.setdefault(chunk.file_path, [])
+                
                 # Create document content with metadata
                 doc_content = f"{chunk.content}\n\nFile: {chunk.file_path}\nType: {chunk.chunk_type}"
                 if chunk.name:
@@ -401,16 +635,21 @@ class CodeIndexer:
                     "language": chunk.language,
                     "chunk_type": chunk.chunk_type,
                     "name": chunk.name or "",
-                    "dependencies": chunk.dependencies
+                    # Chroma metadata values must be scalars, so encode the list once here
+                    "dependencies": orjson.dumps(chunk.dependencies).decode('utf-8')
                 }
                 metadatas.append(metadata)
                 
                 # Create unique ID
-                chunk_id = f"{Path(chunk.file_path).stem}_{chunk.chunk_type}_{i}"
+                chunk_id = f"{_chunk_id_prefix(chunk.file_path)}_{chunk.chunk_type}_{len(chunk_ids)}"
+                chunk_ids.append(chunk_id)
                 ids.append(chunk_id)
             
             # Add to vector database
             await self.vector_db_manager.add_documents(documents, metadatas, ids)
+            self.invalidate_search_cache()
+            
+            return file_chunk_ids
             
         except Exception as e:
             logger.error(f"Error storing chunks in vector DB: {str(e)}")
@@ -420,64 +659,214 @@ class CodeIndexer:
         self,
         query: str,
         k: int = 5,
-        threshold: float = 0.3
+        threshold: float = 0.3,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar code chunks"""
+        """
+        Search for similar code chunks, reusing recent results for repeated queries;
+        query_embedding, if the caller already has it, saves embedding the query again
+        """
         try:
-            results = await self.vector_db_manager.similarity_search(query, k, threshold)
+            cache_key = (" ".join(query.split()).lower(), k, round(threshold, 3), self._index_version)
+            cached = self._search_cache.get(cache_key)
+            if cached:
+                if cached[0] > time.monotonic():
+                    self._search_cache.move_to_end(cache_key)
+                    return cached[1]
+                del self._search_cache[cache_key]
+            
+            if query_embedding is None and self.embedding_cache:
+                query_embedding = (await self.embedding_cache.embed_with_cache(query)).tolist()
+            
+            results = await self.vector_db_manager.similarity_search(query, k, threshold, query_embedding)
+            
+            # Don't cache results if the index changed while searching
+            if cache_key[3] == self._index_version:
+                self._search_cache[cache_key] = (time.monotonic() + settings.search_cache_ttl, results)
+                while len(self._search_cache) > settings.search_cache_size:
+                    self._search_cache.popitem(last=False)
+            
             return results
         except Exception as e:
             logger.error(f"Error in similarity search: {str(e)}")
             return []
     
+    def invalidate_search_cache(self):
+        """Drop cached search results, e.g. after the vector database changed"""
+        self._index_version += 1
+        self._search_cache.clear()
+    
     async def get_file_content(self, file_path: str) -> Optional[str]:
-        """Get content of a specific file"""
+        """Get content of a specific file, reusing the last read while it is unmodified"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            # Read off the event loop so other requests aren't blocked on disk I/O
+            file_stat = await asyncio.to_thread(os.stat, file_path)
+            version = (file_stat.st_mtime_ns, file_stat.st_size)
+            
+            cached = self._content_cache.get(file_path)
+            if cached is not None and cached[0] == version:
+                self._content_cache.move_to_end(file_path)
+                return cached[1]
+            
+            content = await asyncio.to_thread(Path(file_path).read_text, encoding='utf-8')
+            
+            self._content_cache[file_path] = (version, content)
+            self._content_cache.move_to_end(file_path)
+            while len(self._content_cache) > settings.file_content_cache_size:
+                self._content_cache.popitem(last=False)
+            
+            return content
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {str(e)}")
             return None
     
     async def update_file_index(self, file_path: str):
-        """Update index for a specific file"""
+        """Update index for a specific file, skipping it if its content is unchanged"""
         try:
+            file_stat = os.stat(file_path)
+            unchanged, content_hash = await asyncio.to_thread(self._check_file_unchanged, file_path, file_stat)
+            if unchanged:
+                return
+            
             # Remove old chunks from vector database
             await self._remove_file_chunks(file_path)
             
             # Parse file again
-            chunks = self.parser.parse_file(file_path)
+            chunks = await asyncio.to_thread(self.parser.parse_file, file_path)
             
             # Store new chunks
-            await self._store_chunks_in_vector_db(chunks)
+            chunk_ids = await self._store_chunks_in_vector_db(chunks)
             
             # Update file index
-            file_stat = os.stat(file_path)
             self.indexed_files[file_path] = FileIndex(
                 file_path=file_path,
                 language=self.parser.get_language(file_path) or 'unknown',
                 last_modified=file_stat.st_mtime,
                 chunks=chunks,
                 total_chunks=len(chunks),
-                file_size=file_stat.st_size
+                file_size=file_stat.st_size,
+                content_hash=content_hash,
+                chunk_ids=chunk_ids.get(file_path, [])
             )
             
         except Exception as e:
             logger.error(f"Error updating file index: {str(e)}")
     
+    async def update_files_index(self, file_paths: List[str]) -> Dict[str, Any]:
+        """Update index for a batch of changed files with a single embedding pass"""
+        try:
+            changed_files = []
+            removed_files = []
+            
+            for file_path in file_paths:
+                try:
+                    file_stat = os.stat(file_path)
+                except FileNotFoundError:
+                    if file_path in self.indexed_files:
+                        removed_files.append(file_path)
+                    continue
+                
+                if not self.parser.get_language(file_path):
+                    continue
+                
+                # Skip files that are unchanged since they were last indexed
+                unchanged, content_hash = await asyncio.to_thread(self._check_file_unchanged, file_path, file_stat)
+                if not unchanged:
+                    changed_files.append((file_path, file_stat, content_hash))
+            
+            # Remove old chunks from vector database in one call
+            stale_ids = []
+            for file_path in removed_files + [path for path, _, _ in changed_files]:
+                stale_ids.extend(self._get_file_chunk_ids(file_path))
+            
+            if stale_ids:
+                await self.vector_db_manager.delete_documents(stale_ids)
+                self.invalidate_search_cache()
+            
+            for file_path in removed_files:
+                del self.indexed_files[file_path]
+            
+            # Parse changed files off the event loop and store all chunks together
+            chunks_list = await asyncio.to_thread(
+                CodeParser.parse_files, [file_path for file_path, _, _ in changed_files]
+            )
+            
+            all_chunks = []
+            for chunks in chunks_list:
+                all_chunks.extend(chunks)
+            
+            chunk_ids = await self._store_chunks_in_vector_db(all_chunks) if all_chunks else {}
+            
+            for (file_path, file_stat, content_hash), chunks in zip(changed_files, chunks_list):
+                self.indexed_files[file_path] = FileIndex(
+                    file_path=file_path,
+                    language=self.parser.get_language(file_path) or 'unknown',
+                    last_modified=file_stat.st_mtime,
+                    chunks=chunks,
+                    total_chunks=len(chunks),
+                    file_size=file_stat.st_size,
+                    content_hash=content_hash,
+                    chunk_ids=chunk_ids.get(file_path, [])
+                )
+            
+            return {
+                "updated_files": len(changed_files),
+                "removed_files": len(removed_files),
+                "total_chunks": len(all_chunks)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error updating files index: {str(e)}")
+            return {"error": str(e)}
+    
+    @staticmethod
+    def _get_file_states(file_paths: List[str]) -> Dict[str, Tuple[os.stat_result, str]]:
+        """Stat and hash files for their index entries, leaving out files that can't be read"""
+        file_states = {}
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'rb') as f:
+                    file_states[file_path] = (os.fstat(f.fileno()), ParseCache.file_digest(f))
+            except OSError as e:
+                logger.warning(f"Skipping {file_path}: {str(e)}")
+        return file_states
+    
+    def _check_file_unchanged(self, file_path: str, file_stat: os.stat_result) -> Tuple[bool, Optional[str]]:
+        """
+        Compare a file against its index entry, returning (unchanged, content_hash)
+        
+        A matching mtime and size is trusted without reading the file; otherwise
+        the content hash decides, so touches and chmods don't trigger a re-parse.
+        """
+        file_index = self.indexed_files.get(file_path)
+        if (file_index and file_index.last_modified == file_stat.st_mtime
+                and file_index.file_size == file_stat.st_size):
+            return True, file_index.content_hash
+        
+        with open(file_path, 'rb') as f:
+            content_hash = ParseCache.file_digest(f)
+        
+        if file_index and file_index.content_hash == content_hash:
+            # Remember the new mtime so the next check is a stat only
+            file_index.last_modified = file_stat.st_mtime
+            return True, content_hash
+        
+        return False, content_hash
+    
+    def _get_file_chunk_ids(self, file_path: str) -> List[str]:
+        """Get vector database IDs of the indexed chunks for a file"""
+        file_index = self.indexed_files.get(file_path)
+        return file_index.chunk_ids if file_index else []
+    
     async def _remove_file_chunks(self, file_path: str):
         """Remove chunks for a file from vector database"""
         try:
             # Get all chunk IDs for this file
-            chunk_ids = [
-                f"{Path(file_path).stem}_{chunk.chunk_type}_{i}"
-                for i, chunk in enumerate(self.indexed_files.get(file_path, FileIndex(
-                    file_path=file_path, language='', last_modified=0, chunks=[], total_chunks=0, file_size=0
-                )).chunks)
-            ]
+            chunk_ids = self._get_file_chunk_ids(file_path)
             
             if chunk_ids:
                 await self.vector_db_manager.delete_documents(chunk_ids)
+                self.invalidate_search_cache()
                 
         except Exception as e:
             logger.error(f"Error removing file chunks: {str(e)}")
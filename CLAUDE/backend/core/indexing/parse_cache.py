@@ -0,0 +1,119 @@
+"""
+Parse Cache Module
+
+Persists parsed code chunks in SQLite keyed by file content, so unchanged
+files are not re-parsed across indexing runs.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, List, Optional
+
+from .tree_sitter_parser import TREE_SITTER_AVAILABLE
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the parser output changes so stale entries are never returned
+PARSE_CACHE_VERSION = 4
+
+class ParseCache:
+    """SQLite-backed cache of pickled parse results keyed by file path and content hash"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Autocommit mode; WAL lets parser processes read while another writes
+        self._conn = sqlite3.connect(db_path, isolation_level=None, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS parse_cache (key TEXT PRIMARY KEY, blob BLOB)")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(file_path: str, digest: str) -> str:
+        """Build a cache key from the file path, content digest and interpreter version"""
+        return "|".join([
+            str(PARSE_CACHE_VERSION),
+            # Non-Python chunks differ depending on whether tree-sitter is installed
+            "tree-sitter" if TREE_SITTER_AVAILABLE else "regex",
+            f"{sys.version_info.major}.{sys.version_info.minor}",
+            file_path,
+            digest
+        ])
+
+    @staticmethod
+    def file_digest(f: BinaryIO) -> str:
+        """SHA-256 of an open file, hashed through a memory map instead of a copy of its contents"""
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256(b"").hexdigest()
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Any]]:
+        """Return the cached parse result for key, if any"""
+        with self._lock:
+            row = self._conn.execute("SELECT blob FROM parse_cache WHERE key = ?", (key,)).fetchone()
+
+        return pickle.loads(row[0]) if row else None
+
+    def put(self, key: str, chunks: List[Any]):
+        """Store a parse result"""
+        self.put_many([(key, chunks)])
+
+    def put_many(self, items: List[tuple]):
+        """Store several parse results in one transaction"""
+        rows = [(key, pickle.dumps(chunks, protocol=pickle.HIGHEST_PROTOCOL)) for key, chunks in items]
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO parse_cache (key, blob) VALUES (?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        """Drop all cached parse results"""
+        with self._lock:
+            self._conn.execute("DELETE FROM parse_cache")
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+_parse_cache: Optional[ParseCache] = None
+_parse_cache_pid: Optional[int] = None
+_parse_cache_lock = threading.Lock()
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """Get this process's parse cache, opening it on first use"""
+    global _parse_cache, _parse_cache_pid
+
+    if not settings.enable_parse_cache:
+        return None
+
+    # SQLite connections must not be shared with forked parser processes
+    pid = os.getpid()
+    if _parse_cache is None or _parse_cache_pid != pid:
+        with _parse_cache_lock:
+            if _parse_cache is None or _parse_cache_pid != pid:
+                try:
+                    _parse_cache = ParseCache(settings.parse_cache_path)
+                    _parse_cache_pid = pid
+                except Exception as e:
+                    logger.error(f"Error opening parse cache: {str(e)}")
+                    return None
+
+    return _parse_cache
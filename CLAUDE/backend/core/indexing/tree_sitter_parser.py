@@ -0,0 +1,181 @@
+"""
+Tree-sitter Parser Module
+
+Finds function and class definitions in non-Python sources with tree-sitter,
+reusing the previous syntax tree of a file for incremental re-parses.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from tree_sitter_languages import get_language, get_parser
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    TREE_SITTER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# CodeParser language -> tree-sitter grammar name
+GRAMMARS = {
+    'javascript': 'javascript',
+    'typescript': 'typescript',
+    'java': 'java',
+    'cpp': 'cpp',
+    'c': 'c',
+    'go': 'go',
+    'rust': 'rust',
+    'php': 'php',
+    'ruby': 'ruby',
+    'swift': 'swift',
+    'kotlin': 'kotlin',
+    'csharp': 'c_sharp'
+}
+
+# Node types emitted as chunks; types a grammar doesn't define are skipped
+FUNCTION_NODE_TYPES = (
+    'function_declaration', 'generator_function_declaration', 'method_definition',
+    'function_definition', 'method_declaration', 'constructor_declaration',
+    'function_item', 'method', 'singleton_method'
+)
+CLASS_NODE_TYPES = (
+    'class_declaration', 'interface_declaration', 'struct_declaration', 'enum_declaration',
+    'class_specifier', 'struct_specifier', 'struct_item', 'enum_item', 'trait_item',
+    'type_spec', 'object_declaration', 'class', 'module'
+)
+
+# (line_start, line_end, chunk_type, name) with 1-based inclusive lines
+Definition = Tuple[int, int, str, Optional[str]]
+
+class TreeSitterParser:
+    """Extracts definitions with tree-sitter grammars loaded once per process"""
+
+    def __init__(self, max_trees: int = 256):
+        self.max_trees = max_trees
+        self._grammars: Dict[str, Optional[Tuple[Any, Any]]] = {}
+        # file_path -> (grammar, source bytes, tree) of the last parse
+        self._trees: "OrderedDict[str, Tuple[str, bytes, Any]]" = OrderedDict()
+        # tree-sitter parsers are not thread-safe
+        self._lock = threading.Lock()
+
+    def find_definitions(self, file_path: str, data: bytes, language: str) -> Optional[List[Definition]]:
+        """Return the definitions in a file, or None when no grammar is available"""
+        grammar = GRAMMARS.get(language)
+        if not TREE_SITTER_AVAILABLE or not grammar:
+            return None
+
+        with self._lock:
+            loaded = self._load_grammar(grammar)
+            if loaded is None:
+                return None
+            parser, query = loaded
+
+            old_tree = None
+            previous = self._trees.pop(file_path, None)
+            if previous and previous[0] == grammar:
+                old_tree = self._edit_tree(previous[2], previous[1], data)
+
+            tree = parser.parse(data, old_tree) if old_tree else parser.parse(data)
+
+            self._trees[file_path] = (grammar, data, tree)
+            while len(self._trees) > self.max_trees:
+                self._trees.popitem(last=False)
+
+            captures = query.captures(tree.root_node)
+
+        definitions = [
+            (node.start_point[0] + 1, node.end_point[0] + 1, chunk_type, self._node_name(node))
+            for node, chunk_type in captures
+        ]
+        definitions.sort(key=lambda d: d[0])
+        return definitions
+
+    def _load_grammar(self, grammar: str) -> Optional[Tuple[Any, Any]]:
+        """Get the parser and definition query for a grammar, loading it on first use"""
+        if grammar not in self._grammars:
+            try:
+                tree_sitter_language = get_language(grammar)
+                patterns = []
+                for chunk_type, node_types in (('function', FUNCTION_NODE_TYPES), ('class', CLASS_NODE_TYPES)):
+                    for node_type in node_types:
+                        # C/C++ specifiers also appear in plain declarations; require a body
+                        body = " body: (_)" if node_type.endswith('_specifier') else ""
+                        pattern = f"({node_type}{body}) @{chunk_type}"
+                        try:
+                            tree_sitter_language.query(pattern)
+                        except Exception:
+                            continue
+                        patterns.append(pattern)
+
+                self._grammars[grammar] = (get_parser(grammar), tree_sitter_language.query("\n".join(patterns)))
+            except Exception as e:
+                logger.warning(f"Tree-sitter grammar unavailable for {grammar}: {str(e)}")
+                self._grammars[grammar] = None
+
+        return self._grammars[grammar]
+
+    def _edit_tree(self, tree: Any, old_data: bytes, new_data: bytes) -> Any:
+        """Apply the changed byte range between two versions of a file to the old tree"""
+        # Common prefix and suffix bound the edited region
+        start = self._common_prefix_length(old_data, new_data)
+        suffix = self._common_prefix_length(old_data[start:][::-1], new_data[start:][::-1])
+
+        old_end = len(old_data) - suffix
+        new_end = len(new_data) - suffix
+
+        tree.edit(
+            start_byte=start,
+            old_end_byte=old_end,
+            new_end_byte=new_end,
+            start_point=self._point(new_data, start),
+            old_end_point=self._point(old_data, old_end),
+            new_end_point=self._point(new_data, new_end)
+        )
+        return tree
+
+    @staticmethod
+    def _common_prefix_length(a: bytes, b: bytes, block: int = 4096) -> int:
+        """Length of the common prefix of two byte strings, compared block by block"""
+        limit = min(len(a), len(b))
+        length = 0
+        while length + block <= limit and a[length:length + block] == b[length:length + block]:
+            length += block
+        while length < limit and a[length] == b[length]:
+            length += 1
+        return length
+
+    @staticmethod
+    def _point(data: bytes, offset: int) -> Tuple[int, int]:
+        """Convert a byte offset to a (row, column) point"""
+        row = data.count(b"\n", 0, offset)
+        return row, offset - (data.rfind(b"\n", 0, offset) + 1)
+
+    @staticmethod
+    def _node_name(node: Any) -> Optional[str]:
+        """Get the declared name of a definition node"""
+        name_node = node.child_by_field_name('name')
+
+        # C/C++ functions nest the name inside declarators
+        if name_node is None:
+            declarator = node.child_by_field_name('declarator')
+            while declarator is not None and declarator.child_by_field_name('declarator') is not None:
+                declarator = declarator.child_by_field_name('declarator')
+            name_node = declarator
+
+        if name_node is None:
+            return None
+
+        return name_node.text.decode('utf-8', errors='replace')
+
+_tree_sitter_parser: Optional[TreeSitterParser] = None
+
+def get_tree_sitter_parser() -> TreeSitterParser:
+    """Get this process's tree-sitter parser"""
+    global _tree_sitter_parser
+
+    if _tree_sitter_parser is None:
+        _tree_sitter_parser = TreeSitterParser()
+
+    return _tree_sitter_parser
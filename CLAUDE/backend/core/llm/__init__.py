@@ -4,6 +4,6 @@ LLM Module
 Provides LLM orchestration and prompt engineering capabilities.
 """
 
-from .orchestrator import LLMOrchestrator, LLMResponse
+from .orchestrator import LLMOrchestrator, LLMResponse, get_shared_session, close_shared_session
 
-__all__ = ["LLMOrchestrator", "LLMResponse"]
\ No newline at end of file
+__all__ = ["LLMOrchestrator", "LLMResponse", "get_shared_session", "close_shared_session"]
\ No newline at end of file
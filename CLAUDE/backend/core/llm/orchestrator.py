@@ -7,7 +7,9 @@ including prompt engineering, model management, and response generation.
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import aiohttp
 import asyncio
@@ -17,6 +19,33 @@ from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# One pooled HTTP session shared by all orchestrators, so keep-alive
+# connections to Ollama are reused across calls and instances
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, creating it if needed"""
+    global _shared_session
+    
+    if _shared_session is None or _shared_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.llm_connection_limit,
+            limit_per_host=settings.llm_connections_per_host,
+            keepalive_timeout=settings.llm_keepalive_timeout,
+            enable_cleanup_closed=True
+        )
+        _shared_session = aiohttp.ClientSession(connector=connector)
+    
+    return _shared_session
+
+async def close_shared_session():
+    """Close the shared HTTP session, e.g. at application shutdown"""
+    global _shared_session
+    
+    if _shared_session is not None:
+        await _shared_session.close()
+        _shared_session = None
+
 @dataclass
 class LLMResponse:
     """Response from LLM"""
@@ -33,13 +62,29 @@ class LLMOrchestrator:
         self.base_url = base_url or settings.ollama_base_url
         self.session: Optional[aiohttp.ClientSession] = None
         
+        # (available, expires_at) from the last availability check
+        self._availability: Optional[Tuple[bool, float]] = None
+        self._availability_lock = asyncio.Lock()
+        
+        # In-flight generations keyed by request payload, shared by identical concurrent calls
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.ensure_client()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self.close()
+    
+    def ensure_client(self) -> aiohttp.ClientSession:
+        """Attach the shared HTTP session if not attached yet"""
+        if not self.session or self.session.closed:
+            self.session = get_shared_session()
+        return self.session
+    
+    async def close(self):
+        """Detach from the shared HTTP session; close_shared_session() closes it"""
+        self.session = None
     
     async def generate_response(
         self,
@@ -51,43 +96,27 @@ class LLMOrchestrator:
     ) -> LLMResponse:
         """
         Generate response from LLM with optional context
+        
+        The response is streamed from Ollama and accumulated token by token
+        rather than buffered as one JSON body. Concurrent calls with the same
+        request share a single generation.
         """
         try:
             # Build the full prompt with context
             full_prompt = self._build_prompt(prompt, system_prompt, context)
             
             # Prepare request payload
-            payload = {
-                "model": self.model_name,
-                "prompt": full_prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                }
-            }
+            payload = self._build_payload(full_prompt, temperature, max_tokens, stream=True)
             
-            if max_tokens:
-                payload["options"]["num_predict"] = max_tokens
+            key = json.dumps(payload, sort_keys=True)
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._generate(payload))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done: self._finish_inflight(key, done))
             
-            # Make request to Ollama
-            async with self.session.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=300)  # 5 minutes
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"LLM API error: {response.status} - {error_text}")
-                    raise Exception(f"LLM API request failed: {response.status}")
-                
-                result = await response.json()
-                
-                return LLMResponse(
-                    content=result.get("response", ""),
-                    model=self.model_name,
-                    usage=result.get("usage", {}),
-                    metadata=result.get("metadata", {})
-                )
+            # One caller going away must not cancel the generation for the others
+            return await asyncio.shield(task)
                 
         except asyncio.TimeoutError:
             logger.error("LLM request timeout")
@@ -96,6 +125,110 @@ class LLMOrchestrator:
             logger.error(f"Error generating LLM response: {str(e)}")
             raise
     
+    async def _generate(self, payload: Dict[str, Any]) -> LLMResponse:
+        """
+        Run a generate request, accumulating the streamed tokens
+        """
+        tokens = []
+        final_chunk: Dict[str, Any] = {}
+        async for chunk in self._stream_generate(payload):
+            tokens.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                final_chunk = chunk
+        
+        return LLMResponse(
+            content="".join(tokens),
+            model=self.model_name,
+            usage=final_chunk.get("usage", {}),
+            metadata=final_chunk.get("metadata", {})
+        )
+    
+    def _finish_inflight(self, key: str, task: asyncio.Task):
+        """
+        Forget a finished generation; its error was already raised to any waiting callers
+        """
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+    
+    async def generate_response_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        context: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream response tokens from LLM as they are generated
+        """
+        try:
+            full_prompt = self._build_prompt(prompt, system_prompt, context)
+            payload = self._build_payload(full_prompt, temperature, max_tokens, stream=True)
+            
+            async for chunk in self._stream_generate(payload):
+                token = chunk.get("response", "")
+                if token:
+                    yield token
+                
+        except asyncio.TimeoutError:
+            logger.error("LLM request timeout")
+            raise Exception("LLM request timeout")
+        except Exception as e:
+            logger.error(f"Error streaming LLM response: {str(e)}")
+            raise
+    
+    async def _stream_generate(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Post a streaming generate request and yield each decoded chunk
+        """
+        self.ensure_client()
+        
+        async with self.session.post(
+            f"{self.base_url}/api/generate",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=300)  # 5 minutes
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"LLM API error: {response.status} - {error_text}")
+                raise Exception(f"LLM API request failed: {response.status}")
+            
+            # Ollama streams one JSON object per line
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                
+                chunk = json.loads(line)
+                yield chunk
+                
+                if chunk.get("done"):
+                    break
+    
+    def _build_payload(
+        self,
+        full_prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool
+    ) -> Dict[str, Any]:
+        """
+        Build Ollama generate request payload
+        """
+        payload = {
+            "model": self.model_name,
+            "prompt": full_prompt,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+            }
+        }
+        
+        if max_tokens:
+            payload["options"]["num_predict"] = max_tokens
+        
+        return payload
+    
     def _build_prompt(
         self,
         user_prompt: str,
@@ -144,9 +277,31 @@ class LLMOrchestrator:
             max_tokens=2000
         )
     
-    def _get_code_generation_system_prompt(self, style_guidelines: Optional[str] = None) -> str:
+    async def generate_code_stream(
+        self,
+        problem_description: str,
+        code_context: Optional[List[str]] = None,
+        style_guidelines: Optional[str] = None
+    ) -> AsyncIterator[str]:
         """
-        Generate system prompt for code generation
+        Stream generated code tokens with style awareness and context
+        """
+        system_prompt = self._get_code_generation_system_prompt(style_guidelines)
+        
+        async for token in self.generate_response_stream(
+            prompt=problem_description,
+            system_prompt=system_prompt,
+            context=code_context,
+            temperature=0.3,
+            max_tokens=2000
+        ):
+            yield token
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _get_code_generation_system_prompt(style_guidelines: Optional[str] = None) -> str:
+        """
+        Generate system prompt for code generation, cached per style guidelines
         """
         base_prompt = """You are a senior software engineer with expertise in multiple programming languages. 
 Generate clean, efficient, and well-documented code that follows best practices.
@@ -193,11 +348,23 @@ Provide a concise summary of the style patterns observed."""
     
     async def check_model_availability(self) -> bool:
         """
-        Check if the specified model is available in Ollama
+        Check if the specified model is available in Ollama, reusing the
+        last answer for a short TTL
+        """
+        async with self._availability_lock:
+            if self._availability and self._availability[1] > time.monotonic():
+                return self._availability[0]
+            
+            available = await self._fetch_model_availability()
+            self._availability = (available, time.monotonic() + settings.availability_cache_ttl)
+            return available
+    
+    async def _fetch_model_availability(self) -> bool:
+        """
+        Query Ollama for the list of available models
         """
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            self.ensure_client()
             
             async with self.session.get(f"{self.base_url}/api/tags") as response:
                 if response.status == 200:
@@ -214,8 +381,7 @@ Provide a concise summary of the style patterns observed."""
         Pull the model if not available
         """
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            self.ensure_client()
             
             logger.info(f"Pulling model: {self.model_name}")
             
@@ -228,7 +394,13 @@ Provide a concise summary of the style patterns observed."""
                 json=payload,
                 timeout=aiohttp.ClientTimeout(total=1800)  # 30 minutes
             ) as response:
-                return response.status == 200
+                success = response.status == 200
+                
+            if success:
+                # Availability changed; don't serve the cached answer
+                self._availability = None
+            
+            return success
         except Exception as e:
             logger.error(f"Error pulling model: {str(e)}")
             return False
\ No newline at end of file
@@ -5,5 +5,7 @@ Provides Retrieval-Augmented Generation capabilities for context-aware code gene
 """
 
 from .engine import RAGEngine, RAGQuery, RAGResult, RetrievedCode
+from .response_cache import SemanticResponseCache
+from .embedding_cache import EmbeddingCache
 
-__all__ = ["RAGEngine", "RAGQuery", "RAGResult", "RetrievedCode"]
\ No newline at end of file
+__all__ = ["RAGEngine", "RAGQuery", "RAGResult", "RetrievedCode", "SemanticResponseCache", "EmbeddingCache"]
\ No newline at end of file
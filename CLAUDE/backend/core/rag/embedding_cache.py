@@ -0,0 +1,65 @@
+"""
+Embedding Cache Module
+
+Caches query embeddings so repeated questions skip the embedding model's
+forward pass.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """LRU cache of text embeddings keyed by the SHA-256 of the normalized text"""
+
+    def __init__(self, embed_fn: Callable[[str], List[float]], maxsize: Optional[int] = None):
+        self.embed_fn = embed_fn
+        self.maxsize = maxsize or settings.embedding_cache_size
+        self._embeddings: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str) -> bytes:
+        """Build a cache key from the normalized text"""
+        return hashlib.sha256(text.strip().lower().encode("utf-8")).digest()
+
+    async def embed_with_cache(self, text: str) -> np.ndarray:
+        """Return the cached embedding for text, computing it on a miss"""
+        key = self.make_key(text)
+
+        embedding = self._embeddings.get(key)
+        if embedding is not None:
+            self._embeddings.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+        self.misses += 1
+        # Encoding is CPU-bound; run it off the event loop
+        embedding = np.asarray(await asyncio.to_thread(self.embed_fn, text), dtype=np.float32)
+
+        self._embeddings[key] = embedding
+        if len(self._embeddings) > self.maxsize:
+            self._embeddings.popitem(last=False)
+
+        return embedding
+
+    def clear(self):
+        """Drop all cached embeddings"""
+        self._embeddings.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "entries": len(self._embeddings),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -6,20 +6,16 @@ This module handles code retrieval, context building, and enhanced prompt genera
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
-import asyncio
-from pathlib import Path
-import re
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, replace
 
-from ..llm.orchestrator import LLMOrchestrator, LLMResponse
+from ..llm.orchestrator import LLMOrchestrator
 from ..indexing.code_indexer import CodeIndexer
-from ..style.style_analyzer import StyleAnalyzer
-from ..config.settings import settings
+from ..style.style_analyzer import CodeStyleAnalyzer
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedCode:
     """Retrieved code chunk with metadata"""
     content: str
@@ -30,7 +26,7 @@ class RetrievedCode:
     language: str
     chunk_type: str  # "function", "class", "import", etc.
 
-@dataclass
+@dataclass(slots=True)
 class RAGQuery:
     """Query for RAG system"""
     question: str
@@ -39,7 +35,7 @@ class RAGQuery:
     max_context_chunks: int = 5
     similarity_threshold: float = 0.3
 
-@dataclass
+@dataclass(slots=True)
 class RAGResult:
     """Result from RAG system"""
     answer: str
@@ -53,12 +49,17 @@ class RAGEngine:
     def __init__(
         self,
         code_indexer: CodeIndexer,
-        style_analyzer: StyleAnalyzer,
-        llm_orchestrator: LLMOrchestrator
+        style_analyzer: CodeStyleAnalyzer,
+        llm_orchestrator: LLMOrchestrator,
+        response_cache=None,
+        embedding_cache=None
     ):
         self.code_indexer = code_indexer
         self.style_analyzer = style_analyzer
         self.llm_orchestrator = llm_orchestrator
+        # Optional SemanticResponseCache; question embeddings come from embedding_cache
+        self.response_cache = response_cache
+        self.embedding_cache = embedding_cache
         
     async def query(
         self,
@@ -69,27 +70,24 @@ class RAGEngine:
         Execute RAG query: retrieve context and generate enhanced response
         """
         try:
-            # Step 1: Retrieve relevant code chunks
-            retrieved_code = await self._retrieve_relevant_code(query)
+            # Answer repeated or near-identical questions without retrieval or generation
+            cached, cache_key, question_embedding = await self._lookup_cached_result(query)
+            if cached is not None:
+                return replace(cached, query=query)
             
-            # Step 2: Build enhanced prompt with context
-            context_text = self._build_context_text(retrieved_code)
-            
-            # Step 3: Get style guidelines if requested
-            style_guidelines = None
-            if include_style_context:
-                style_guidelines = await self.style_analyzer.get_style_guidelines()
+            # Steps 1-3: Retrieve context, get style guidelines and build prompt
+            retrieved_code, enhanced_prompt, style_guidelines = await self._prepare_generation(
+                query, include_style_context, question_embedding
+            )
             
             # Step 4: Generate enhanced response
-            enhanced_prompt = self._build_enhanced_prompt(query.question, context_text)
-            
             response = await self.llm_orchestrator.generate_code(
                 problem_description=enhanced_prompt,
                 code_context=[ctx.content for ctx in retrieved_code],
                 style_guidelines=style_guidelines
             )
             
-            return RAGResult(
+            result = RAGResult(
                 answer=response.content,
                 retrieved_context=retrieved_code,
                 query=query,
@@ -101,25 +99,135 @@ class RAGEngine:
                 }
             )
             
+            if cache_key is not None:
+                self.response_cache.put(cache_key, result, question_embedding)
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error in RAG query: {str(e)}")
             raise
     
-    async def _retrieve_relevant_code(self, query: RAGQuery) -> List[RetrievedCode]:
+    async def query_stream(
+        self,
+        query: RAGQuery,
+        include_style_context: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Retrieve relevant code chunks based on query
+        Execute RAG query, yielding the retrieved context first and then
+        answer tokens as the LLM produces them
+        """
+        try:
+            cached, cache_key, question_embedding = await self._lookup_cached_result(query)
+            if cached is not None:
+                # Replay the cached answer as a single token
+                yield {"type": "context", "retrieved_context": cached.retrieved_context}
+                yield {"type": "token", "t": cached.answer}
+                yield {"type": "done", "result": replace(cached, query=query)}
+                return
+            
+            retrieved_code, enhanced_prompt, style_guidelines = await self._prepare_generation(
+                query, include_style_context, question_embedding
+            )
+            
+            yield {"type": "context", "retrieved_context": retrieved_code}
+            
+            answer_parts = []
+            async for token in self.llm_orchestrator.generate_code_stream(
+                problem_description=enhanced_prompt,
+                code_context=[ctx.content for ctx in retrieved_code],
+                style_guidelines=style_guidelines
+            ):
+                answer_parts.append(token)
+                yield {"type": "token", "t": token}
+            
+            result = RAGResult(
+                answer="".join(answer_parts),
+                retrieved_context=retrieved_code,
+                query=query,
+                metadata={
+                    "model_used": self.llm_orchestrator.model_name,
+                    "usage": {},
+                    "style_context_included": include_style_context,
+                    "retrieved_chunks_count": len(retrieved_code)
+                }
+            )
+            
+            if cache_key is not None:
+                self.response_cache.put(cache_key, result, question_embedding)
+            
+            yield {"type": "done", "result": result}
+            
+        except Exception as e:
+            logger.error(f"Error in streaming RAG query: {str(e)}")
+            raise
+    
+    async def _lookup_cached_result(self, query: RAGQuery) -> Tuple[Optional[RAGResult], Any, Any]:
+        """
+        Look up a cached result for a query, checking exact matches before similar
+        questions; also returns the key and question embedding to store a miss under
+        """
+        if self.response_cache is None:
+            return None, None, None
+        
+        cache_key = self.response_cache.make_key(query)
+        result = self.response_cache.get_exact(cache_key)
+        
+        question_embedding = None
+        if result is None and self.embedding_cache is not None:
+            question_embedding = await self.embedding_cache.embed_with_cache(query.question)
+            result = self.response_cache.get_semantic(cache_key, question_embedding)
+        
+        return result, cache_key, question_embedding
+    
+    async def _prepare_generation(
+        self,
+        query: RAGQuery,
+        include_style_context: bool,
+        question_embedding: Any = None
+    ) -> Tuple[List[RetrievedCode], str, Optional[str]]:
+        """
+        Retrieve relevant code, get style guidelines and build the enhanced prompt
+        """
+        # Retrieve relevant code chunks
+        retrieved_code = await self._retrieve_relevant_code(query, question_embedding)
+        
+        # Build context text
+        context_text = self._build_context_text(retrieved_code)
+        
+        # Get style guidelines if requested
+        style_guidelines = None
+        if include_style_context:
+            style_guidelines = await self.style_analyzer.get_style_guidelines()
+        
+        enhanced_prompt = self._build_enhanced_prompt(query.question, context_text)
+        
+        return retrieved_code, enhanced_prompt, style_guidelines
+    
+    async def _retrieve_relevant_code(
+        self,
+        query: RAGQuery,
+        question_embedding: Any = None
+    ) -> List[RetrievedCode]:
+        """
+        Retrieve relevant code chunks based on query, reusing the question's
+        embedding when the search text is the question itself
         """
         try:
             # Build search query with language context
             search_query = query.question
+            query_embedding = None
             if query.language:
                 search_query += f" {query.language}"
+            elif question_embedding is not None:
+                query_embedding = question_embedding.tolist()
             
             # Retrieve from vector database
             results = await self.code_indexer.similarity_search(
                 query=search_query,
                 k=query.max_context_chunks,
-                threshold=query.similarity_threshold
+                threshold=query.similarity_threshold,
+                query_embedding=query_embedding
             )
             
             # Convert to RetrievedCode objects
@@ -135,9 +243,7 @@ class RAGEngine:
                     chunk_type=result["metadata"]["chunk_type"]
                 ))
             
-            # Sort by relevance score
-            retrieved_code.sort(key=lambda x: x.score, reverse=True)
-            
+            # Results already come ranked by relevance score from the vector database
             return retrieved_code
             
         except Exception as e:
@@ -151,17 +257,16 @@ class RAGEngine:
         if not retrieved_code:
             return ""
         
-        context_parts = []
-        context_parts.append("Relevant code from your codebase:")
-        
-        for i, code in enumerate(retrieved_code, 1):
-            context_parts.append(f"\n--- Code Snippet {i} ---")
-            context_parts.append(f"File: {code.file_path} (lines {code.line_start}-{code.line_end})")
-            context_parts.append(f"Language: {code.language} | Type: {code.chunk_type}")
-            context_parts.append(f"Relevance Score: {code.score:.3f}")
-            context_parts.append("```")
-            context_parts.append(code.content)
-            context_parts.append("```")
+        # One f-string per snippet; str.format on a shared template is several times slower
+        context_parts = ["Relevant code from your codebase:"]
+        context_parts.extend(
+            f"\n--- Code Snippet {i} ---\n"
+            f"File: {code.file_path} (lines {code.line_start}-{code.line_end})\n"
+            f"Language: {code.language} | Type: {code.chunk_type}\n"
+            f"Relevance Score: {code.score:.3f}\n"
+            f"```\n{code.content}\n```"
+            for i, code in enumerate(retrieved_code, 1)
+        )
         
         return "\n".join(context_parts)
     
@@ -169,10 +274,11 @@ class RAGEngine:
         """
         Build enhanced prompt with retrieved context
         """
-        enhanced_prompt = user_question
+        if not context_text:
+            return user_question
         
-        if context_text:
-            enhanced_prompt = f"""
+        # An f-string builds the prompt in one step; str.format on a template is several times slower
+        return f"""
 {user_question}
 
 {context_text}
@@ -180,8 +286,6 @@ class RAGEngine:
 Please use the relevant code snippets above as context and reference for your solution.
 Prioritize using similar patterns, functions, and classes from the codebase when applicable.
 """
-        
-        return enhanced_prompt
     
     async def explain_code(
         self,
@@ -231,20 +335,44 @@ Prioritize using similar patterns, functions, and classes from the codebase when
         """
         Generate implementation based on requirements
         """
+        query = self._build_implementation_query(requirements, language, framework)
+        
+        return await self.query(query)
+    
+    def generate_implementation_stream(
+        self,
+        requirements: str,
+        language: Optional[str] = None,
+        framework: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream implementation generated from requirements
+        """
+        query = self._build_implementation_query(requirements, language, framework)
+        
+        return self.query_stream(query)
+    
+    def _build_implementation_query(
+        self,
+        requirements: str,
+        language: Optional[str] = None,
+        framework: Optional[str] = None
+    ) -> RAGQuery:
+        """
+        Build RAG query for an implementation request
+        """
         impl_query = requirements
         if language:
             impl_query += f"\nLanguage: {language}"
         if framework:
             impl_query += f"\nFramework: {framework}"
         
-        query = RAGQuery(
+        return RAGQuery(
             question=impl_query,
             language=language,
             context_type="implementation",
             max_context_chunks=7
         )
-        
-        return await self.query(query)
     
     async def suggest_improvements(
         self,
@@ -0,0 +1,212 @@
+"""
+Response Cache Module
+
+Caches RAG query results so that repeated or near-identical questions can be
+answered without re-running retrieval and generation.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import RAGQuery, RAGResult
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Lookup key for a cached RAG response"""
+    exact: str
+    params: str
+    generation: int
+
+@dataclass
+class CacheEntry:
+    """Cached RAG response with its question embedding"""
+    result: RAGResult
+    expires_at: float
+    embedding: Optional[np.ndarray] = None
+    # LSH buckets holding this entry's key, one per table, if it has an embedding
+    bucket_keys: Tuple[Tuple[str, int, int], ...] = ()
+
+class SemanticResponseCache:
+    """Two-tier response cache: exact-match lookup backed by an LSH semantic tier"""
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        similarity_threshold: Optional[float] = None,
+        num_tables: int = 4,
+        planes_per_table: int = 8,
+        seed: int = 0
+    ):
+        self.maxsize = maxsize or settings.response_cache_size
+        self.ttl = ttl or settings.response_cache_ttl
+        self.similarity_threshold = (
+            settings.response_cache_similarity if similarity_threshold is None else similarity_threshold
+        )
+        # Several short signatures rather than one long one: a neighbour at cosine 0.95
+        # shares an 8-plane bucket about 43% of the time, and one of 4 tables about 89%.
+        # Candidates from every table are then scored exactly against the threshold
+        self.num_tables = num_tables
+        self.planes_per_table = planes_per_table
+        self.seed = seed
+        self.generation = 0
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, int], List[str]] = {}
+        self._planes: Optional[np.ndarray] = None
+
+        self.hits = {"exact": 0, "semantic": 0}
+        self.misses = 0
+
+    def make_key(self, query: RAGQuery) -> CacheKey:
+        """Build a cache key from the normalized query parameters"""
+        params = json.dumps([
+            (query.language or "").lower(),
+            query.context_type or "",
+            query.max_context_chunks,
+            query.similarity_threshold
+        ])
+        question = " ".join(query.question.split()).lower()
+
+        return CacheKey(
+            exact=hashlib.sha256(json.dumps([params, question]).encode("utf-8")).hexdigest(),
+            params=hashlib.sha256(params.encode("utf-8")).hexdigest(),
+            generation=self.generation
+        )
+
+    def get_exact(self, key: CacheKey) -> Optional[RAGResult]:
+        """Return a cached result for an exact key match"""
+        entry = self._get_live_entry(key.exact)
+        if entry is None:
+            return None
+
+        self.hits["exact"] += 1
+        return entry.result
+
+    def get_semantic(self, key: CacheKey, embedding: Sequence[float]) -> Optional[RAGResult]:
+        """Return a cached result whose question embedding is similar enough"""
+        vector = self._normalize(embedding)
+
+        # An entry can share a bucket with the query in several tables; score it once
+        candidates: Dict[str, None] = {}
+        for bucket_key in self._bucket_keys(key.params, vector):
+            candidates.update(dict.fromkeys(self._buckets.get(bucket_key, ())))
+
+        best_entry = None
+        best_score = self.similarity_threshold
+
+        # Expired entries drop out of their buckets as they are looked up
+        for exact_key in candidates:
+            entry = self._get_live_entry(exact_key)
+            if entry is None:
+                continue
+
+            score = float(np.dot(vector, entry.embedding))
+            if score >= best_score:
+                best_entry, best_score = entry, score
+
+        if best_entry is not None:
+            self.hits["semantic"] += 1
+            return best_entry.result
+
+        self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, result: RAGResult, embedding: Optional[Sequence[float]] = None):
+        """Store a result, unless the cache was invalidated since the key was made"""
+        if key.generation != self.generation:
+            return
+
+        entry = CacheEntry(result=result, expires_at=time.monotonic() + self.ttl)
+
+        # A replaced entry may sit in different buckets
+        previous = self._entries.pop(key.exact, None)
+        if previous is not None:
+            self._remove_from_buckets(key.exact, previous)
+
+        if embedding is not None:
+            entry.embedding = self._normalize(embedding)
+            entry.bucket_keys = self._bucket_keys(key.params, entry.embedding)
+            for bucket_key in entry.bucket_keys:
+                self._buckets.setdefault(bucket_key, []).append(key.exact)
+
+        self._entries[key.exact] = entry
+
+        while len(self._entries) > self.maxsize:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._remove_from_buckets(evicted_key, evicted)
+
+    def invalidate(self):
+        """Drop all cached responses, e.g. after the indexed code changed"""
+        self.generation += 1
+        self._entries.clear()
+        self._buckets.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "entries": len(self._entries),
+            "generation": self.generation,
+            "exact_hits": self.hits["exact"],
+            "semantic_hits": self.hits["semantic"],
+            "misses": self.misses
+        }
+
+    def _get_live_entry(self, exact_key: str) -> Optional[CacheEntry]:
+        """Get an entry if present and not expired"""
+        entry = self._entries.get(exact_key)
+        if entry is None:
+            return None
+
+        if entry.expires_at < time.monotonic():
+            del self._entries[exact_key]
+            self._remove_from_buckets(exact_key, entry)
+            return None
+
+        self._entries.move_to_end(exact_key)
+        return entry
+
+    def _remove_from_buckets(self, exact_key: str, entry: CacheEntry):
+        """Drop a removed entry's key from its LSH buckets"""
+        for bucket_key in entry.bucket_keys:
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                continue
+
+            try:
+                bucket.remove(exact_key)
+            except ValueError:
+                pass
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    def _normalize(self, embedding: Sequence[float]) -> np.ndarray:
+        """Convert embedding to a unit-length float32 vector"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _bucket_keys(self, params: str, vector: np.ndarray) -> Tuple[Tuple[str, int, int], ...]:
+        """LSH bucket of a vector in each table, as (params, table, signature)"""
+        return tuple((params, table, signature) for table, signature in enumerate(self._signatures(vector)))
+
+    def _signatures(self, vector: np.ndarray) -> List[int]:
+        """Signed random-projection LSH signature of a vector in each table"""
+        if self._planes is None or self._planes.shape[1] != vector.shape[0]:
+            rng = np.random.default_rng(self.seed)
+            self._planes = rng.standard_normal(
+                (self.num_tables * self.planes_per_table, vector.shape[0])
+            ).astype(np.float32)
+
+        bits = ((self._planes @ vector) >= 0).reshape(self.num_tables, self.planes_per_table)
+        return [int.from_bytes(row.tobytes(), "big") for row in np.packbits(bits, axis=1)]
@@ -5,5 +5,6 @@ Provides code style analysis and pattern extraction capabilities.
 """
 
 from .style_analyzer import CodeStyleAnalyzer, StyleGuidelines, StylePattern
+from .style_cache import StyleCache, open_style_cache
 
-__all__ = ["CodeStyleAnalyzer", "StyleGuidelines", "StylePattern"]
\ No newline at end of file
+__all__ = ["CodeStyleAnalyzer", "StyleGuidelines", "StylePattern", "StyleCache", "open_style_cache"]
\ No newline at end of file
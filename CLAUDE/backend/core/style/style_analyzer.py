@@ -5,21 +5,60 @@ Analyzes code style patterns from the codebase and provides style guidelines
 for consistent code generation.
 """
 
+import ast
 import re
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
-from collections import defaultdict, Counter
+import textwrap
+from typing import Dict, List, Any, Optional, Tuple, Type
+from dataclasses import dataclass, field
+from enum import IntEnum
+from collections import Counter
 import asyncio
+from concurrent.futures import Executor
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
+from .style_cache import open_style_cache
 from ..indexing.code_indexer import CodeIndexer, CodeChunk
 from ..llm.orchestrator import LLMOrchestrator
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Simple assignment patterns for Python, used when a chunk doesn't parse
+_VAR_RE = re.compile(r'\b([a-z_][a-z0-9_]*)\s*=')
+_CONST_RE = re.compile(r'\b([A-Z_][A-Z0-9_]*)\s*=')
+_CONST_NAME_RE = re.compile(r'[A-Z_][A-Z0-9_]*')
+_KEYWORDS = frozenset({'if', 'for', 'while', 'with', 'def', 'class', 'import', 'from'})
+
+class IndentationStyle(IntEnum):
+    """Per-line indentation codes; 0 means no indentation"""
+    SPACES_4 = 1
+    SPACES_2 = 2
+    TABS = 3
+
+class OperatorSpacing(IntEnum):
+    """Per-line assignment spacing codes; 0 means no assignment"""
+    SPACED = 1
+    UNSPACED = 2
+
+@lru_cache(maxsize=65536)
+def _naming_style(name: str) -> str:
+    """Classify the naming style of a name; identifiers repeat heavily across chunks"""
+    if name.isupper():
+        return 'UPPER_CASE'
+    elif name[0].isupper() and '_' not in name:
+        return 'PascalCase'
+    elif name.islower() and '_' in name:
+        return 'snake_case'
+    elif name[0].islower() and '_' not in name:
+        return 'camelCase'
+    else:
+        return 'mixed'
+
+@dataclass(slots=True)
 class StylePattern:
     """Represents a detected style pattern"""
     pattern_type: str
@@ -28,7 +67,7 @@ class StylePattern:
     examples: List[str]
     confidence: float
 
-@dataclass
+@dataclass(slots=True)
 class StyleGuidelines:
     """Comprehensive style guidelines for code generation"""
     naming_conventions: Dict[str, str]
@@ -40,13 +79,67 @@ class StyleGuidelines:
     language_specific: Dict[str, Any]
     overall_style_profile: str
 
+@dataclass
+class StyleTallies:
+    """Raw style counts gathered in one pass over a set of chunks"""
+    naming: Dict[str, Counter] = field(default_factory=lambda: {
+        'variables': Counter(),
+        'functions': Counter(),
+        'classes': Counter(),
+        'constants': Counter()
+    })
+    comments: Dict[str, int] = field(default_factory=lambda: {
+        'inline_comments': 0,
+        'block_comments': 0,
+        'docstrings': 0,
+        'total_lines': 0,
+        'comment_lines': 0
+    })
+    import_styles: Counter = field(default_factory=Counter)
+    error_patterns: set = field(default_factory=set)
+    documentation: Dict[str, int] = field(default_factory=lambda: {
+        'functions_with_docstrings': 0,
+        'classes_with_docstrings': 0,
+        'total_functions': 0,
+        'total_classes': 0
+    })
+    # Last chunk of each language, in order of first appearance
+    last_chunks: Dict[str, CodeChunk] = field(default_factory=dict)
+    
+    def merge(self, other: "StyleTallies"):
+        """Add the tallies of chunks that follow this record's chunks"""
+        for category, counter in other.naming.items():
+            self.naming[category].update(counter)
+        for key, count in other.comments.items():
+            self.comments[key] += count
+        for key, count in other.documentation.items():
+            self.documentation[key] += count
+        self.import_styles.update(other.import_styles)
+        self.error_patterns |= other.error_patterns
+        self.last_chunks.update(other.last_chunks)
+
 class CodeStyleAnalyzer:
     """Analyzes code style patterns from indexed code"""
     
-    def __init__(self, code_indexer: CodeIndexer, llm_orchestrator: LLMOrchestrator):
+    def __init__(
+        self,
+        code_indexer: CodeIndexer,
+        llm_orchestrator: LLMOrchestrator,
+        executor: Optional[Executor] = None
+    ):
         self.code_indexer = code_indexer
         self.llm_orchestrator = llm_orchestrator
+        # Process pool for tallying large codebases in shards
+        self.executor = executor
         self.style_cache: Dict[str, StyleGuidelines] = {}
+        # Formatted guidelines text per language, built from style_cache["codebase_style"]
+        self._guidelines_text_cache: Dict[str, str] = {}
+        # Guidelines persisted across restarts, keyed by the indexed codebase's hash
+        self.persistent_cache = open_style_cache()
+        # Analysis in progress, shared by concurrent callers
+        self._analysis_task: Optional[asyncio.Task] = None
+        # file_path -> (FileIndex, tallies); re-indexing a file replaces its FileIndex
+        self._file_tallies: Dict[str, Tuple[Any, StyleTallies]] = {}
         
     async def analyze_codebase_style(self, force_refresh: bool = False) -> StyleGuidelines:
         """Analyze style patterns from the entire codebase"""
@@ -55,26 +148,56 @@ class CodeStyleAnalyzer:
         if not force_refresh and cache_key in self.style_cache:
             return self.style_cache[cache_key]
         
+        # Concurrent callers wait for the running analysis instead of starting their own;
+        # a forced refresh always starts a new one
+        task = self._analysis_task
+        if force_refresh or task is None or task.done():
+            task = asyncio.ensure_future(self._analyze_codebase_style(cache_key, force_refresh))
+            self._analysis_task = task
+        
+        return await asyncio.shield(task)
+    
+    async def _analyze_codebase_style(self, cache_key: str, force_refresh: bool) -> StyleGuidelines:
+        """Run a codebase style analysis and cache its result"""
         try:
             # Get all indexed chunks
+            file_indexes = list(self.code_indexer.indexed_files.items())
             all_chunks = []
-            for file_index in self.code_indexer.indexed_files.values():
+            for _, file_index in file_indexes:
                 all_chunks.extend(file_index.chunks)
             
             if not all_chunks:
                 logger.warning("No code chunks found for style analysis")
                 return self._get_default_style_guidelines()
             
-            # Analyze different aspects of code style
-            naming_patterns = self._analyze_naming_conventions(all_chunks)
-            formatting_patterns = self._analyze_formatting_patterns(all_chunks)
-            comment_patterns = self._analyze_comment_patterns(all_chunks)
-            import_patterns = self._analyze_import_patterns(all_chunks)
-            error_patterns = self._analyze_error_handling_patterns(all_chunks)
-            doc_patterns = self._analyze_documentation_patterns(all_chunks)
+            # Reuse guidelines persisted for this exact codebase
+            codebase_hash = None
+            if self.persistent_cache:
+                codebase_hash = self.persistent_cache.codebase_hash(
+                    (path, index.last_modified, index.file_size, index.content_hash)
+                    for path, index in file_indexes
+                )
+                if not force_refresh:
+                    stored = await asyncio.to_thread(self.persistent_cache.get, cache_key, codebase_hash)
+                    if stored is not None:
+                        guidelines = StyleGuidelines(**stored)
+                        self.style_cache[cache_key] = guidelines
+                        self._guidelines_text_cache.clear()
+                        return guidelines
+            
+            # Analyze different aspects of code style from one pass over the chunks
+            tallies, formatting_patterns = await asyncio.gather(
+                self._tally_files(file_indexes),
+                asyncio.to_thread(self._analyze_formatting_patterns, all_chunks)
+            )
+            naming_patterns = self._analyze_naming_conventions(tallies)
+            comment_patterns = self._analyze_comment_patterns(tallies)
+            import_patterns = self._analyze_import_patterns(tallies)
+            error_patterns = self._analyze_error_handling_patterns(tallies)
+            doc_patterns = self._analyze_documentation_patterns(tallies)
             
             # Group by language
-            language_specific = self._analyze_language_specific_patterns(all_chunks)
+            language_specific = self._analyze_language_specific_patterns(tallies)
             
             # Generate overall style profile
             style_profile = await self._generate_style_profile(all_chunks)
@@ -87,11 +210,15 @@ class CodeStyleAnalyzer:
                 error_handling_patterns=error_patterns,
                 documentation_standards=doc_patterns,
                 language_specific=language_specific,
-                overall_style_profile=style_profile
+                overall_style_profile=style_profile or "Unable to generate style profile"
             )
             
             # Cache the result
             self.style_cache[cache_key] = guidelines
+            self._guidelines_text_cache.clear()
+            # A profile missing because the LLM was down must not outlive a restart
+            if self.persistent_cache and style_profile is not None:
+                await asyncio.to_thread(self.persistent_cache.put, cache_key, codebase_hash, guidelines)
             
             return guidelines
             
@@ -99,38 +226,151 @@ class CodeStyleAnalyzer:
             logger.error(f"Error analyzing codebase style: {str(e)}")
             return self._get_default_style_guidelines()
     
-    def _analyze_naming_conventions(self, chunks: List[CodeChunk]) -> Dict[str, str]:
-        """Analyze naming conventions used in the codebase"""
-        naming_patterns = {
-            'variables': Counter(),
-            'functions': Counter(),
-            'classes': Counter(),
-            'constants': Counter()
-        }
+    async def _tally_files(self, file_indexes: List[Tuple[str, Any]]) -> StyleTallies:
+        """Tally the indexed files, re-tallying only those changed since the last analysis"""
+        previous = self._file_tallies
+        stale = [(path, index) for path, index in file_indexes if previous.get(path, (None,))[0] is not index]
+        fresh = await self._tally_chunk_groups([index.chunks for _, index in stale])
+        
+        # Rebuilt each time so files dropped from the index are forgotten
+        file_tallies = {}
+        for path, index in file_indexes:
+            file_tallies[path] = previous.get(path)
+        for (path, index), tallies in zip(stale, fresh):
+            file_tallies[path] = (index, tallies)
+        self._file_tallies = file_tallies
+        
+        # Merge in file order so first-seen tie-breaking matches a single pass
+        tallies = StyleTallies()
+        for path, _ in file_indexes:
+            tallies.merge(file_tallies[path][1])
+        
+        return tallies
+    
+    async def _tally_chunk_groups(self, groups: List[List[CodeChunk]]) -> List[StyleTallies]:
+        """Tally groups of chunks in shards on the executor, or inline when there are too few to split"""
+        total = sum(len(group) for group in groups)
+        shard_size = max(settings.style_min_shard_size, -(-total // settings.index_workers))
+        if self.executor is None or total <= shard_size:
+            return self._tally_groups(groups)
+        
+        # Pack whole groups into shards of roughly shard_size chunks
+        shards, shard, shard_chunks = [], [], 0
+        for group in groups:
+            shard.append(group)
+            shard_chunks += len(group)
+            if shard_chunks >= shard_size:
+                shards.append(shard)
+                shard, shard_chunks = [], 0
+        if shard:
+            shards.append(shard)
+        
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, CodeStyleAnalyzer._tally_groups, shard)
+            for shard in shards
+        ))
+        
+        return [tallies for shard_results in results for tallies in shard_results]
+    
+    @staticmethod
+    def _tally_groups(groups: List[List[CodeChunk]]) -> List[StyleTallies]:
+        """Tally each group of chunks separately"""
+        return [CodeStyleAnalyzer._tally_chunks(group) for group in groups]
+    
+    @staticmethod
+    def _tally_chunks(chunks: List[CodeChunk]) -> StyleTallies:
+        """Gather naming, comment, import, error handling and documentation counts in one pass"""
+        tallies = StyleTallies()
+        naming = tallies.naming
+        comments = tallies.comments
+        documentation = tallies.documentation
+        error_patterns = tallies.error_patterns
+        import_styles = tallies.import_styles
+        last_chunks = tallies.last_chunks
         
         for chunk in chunks:
-            if chunk.language != 'python':
+            # Read each field once; the checks below branch on them repeatedly
+            content = chunk.content
+            language = chunk.language
+            chunk_type = chunk.chunk_type
+            last_chunks[language] = chunk
+            
+            # Comments and docstring lines; one whole-chunk scan per marker decides
+            # whether any line needs checking for it
+            has_comments = '#' in content
+            has_docstrings = '"""' in content or "'''" in content
+            lines = content.split('\n') if has_comments or has_docstrings else None
+            comments['total_lines'] += len(lines) if lines is not None else content.count('\n') + 1
+            docstring_lines = 0
+            
+            if has_comments:
+                for line in lines:
+                    if '#' not in line:
+                        continue
+                    stripped = line.strip()
+                    if stripped.startswith('#'):
+                        comments['comment_lines'] += 1
+                        if len(stripped) > 1 and stripped[1] == ' ':
+                            comments['inline_comments'] += 1
+            
+            # Check for docstrings (simplified)
+            if has_docstrings:
+                for line in lines:
+                    if '"""' in line or "'''" in line:
+                        docstring_lines += 1
+            
+            comments['docstrings'] += docstring_lines
+            
+            # Import organization
+            if chunk_type == 'import':
+                if 'import ' in content and ' as ' in content:
+                    import_styles['with_alias'] += 1
+                elif 'from ' in content and ' import ' in content:
+                    import_styles['from_import'] += 1
+                else:
+                    import_styles['direct_import'] += 1
+            
+            if language != 'python':
                 continue
-                
-            # Extract function names
-            if chunk.chunk_type == 'function' and chunk.name:
-                naming_patterns['functions'][self._classify_naming_style(chunk.name)] += 1
             
-            # Extract class names
-            elif chunk.chunk_type == 'class' and chunk.name:
-                naming_patterns['classes'][self._classify_naming_style(chunk.name)] += 1
+            # Naming conventions
+            name = chunk.name
+            if chunk_type == 'function' and name:
+                naming['functions'][_naming_style(name)] += 1
+            elif chunk_type == 'class' and name:
+                naming['classes'][_naming_style(name)] += 1
+            elif chunk_type == 'function' or chunk_type == 'class':
+                variables, constants = CodeStyleAnalyzer._extract_variables_and_constants(content)
+                naming['variables'].update(map(_naming_style, variables))
+                naming['constants'].update(map(_naming_style, constants))
+            
+            # Error handling, skipping patterns already seen
+            if len(error_patterns) < 3:
+                if 'try_except' not in error_patterns and 'try:' in content and 'except' in content:
+                    error_patterns.add('try_except')
+                if 'raise_statements' not in error_patterns and 'raise ' in content:
+                    error_patterns.add('raise_statements')
+                if 'assertions' not in error_patterns and 'assert ' in content:
+                    error_patterns.add('assertions')
             
-            # Extract variable names and constants from content
-            elif chunk.chunk_type in ['function', 'class']:
-                variables, constants = self._extract_variables_and_constants(chunk.content)
-                for var in variables:
-                    naming_patterns['variables'][self._classify_naming_style(var)] += 1
-                for const in constants:
-                    naming_patterns['constants'][self._classify_naming_style(const)] += 1
+            # Documentation; quotes can't span lines, so docstring lines mark documented chunks
+            if chunk_type == 'function':
+                documentation['total_functions'] += 1
+                if docstring_lines:
+                    documentation['functions_with_docstrings'] += 1
+            elif chunk_type == 'class':
+                documentation['total_classes'] += 1
+                if docstring_lines:
+                    documentation['classes_with_docstrings'] += 1
         
+        return tallies
+    
+    def _analyze_naming_conventions(self, tallies: StyleTallies) -> Dict[str, str]:
+        """Analyze naming conventions used in the codebase"""
         # Determine most common convention for each type
         result = {}
-        for category, patterns in naming_patterns.items():
+        for category, patterns in tallies.naming.items():
             if patterns:
                 most_common = patterns.most_common(1)[0][0]
                 result[category] = most_common
@@ -141,103 +381,138 @@ class CodeStyleAnalyzer:
     
     def _classify_naming_style(self, name: str) -> str:
         """Classify the naming style of a given name"""
-        if name.isupper():
-            return 'UPPER_CASE'
-        elif name[0].isupper() and '_' not in name:
-            return 'PascalCase'
-        elif name.islower() and '_' in name:
-            return 'snake_case'
-        elif name[0].islower() and '_' not in name:
-            return 'camelCase'
-        else:
-            return 'mixed'
+        return _naming_style(name)
     
-    def _extract_variables_and_constants(self, content: str) -> Tuple[List[str], List[str]]:
-        """Extract variable and constant names from code content"""
-        variables = []
-        constants = []
+    @staticmethod
+    def _extract_variables_and_constants(content: str) -> Tuple[List[str], List[str]]:
+        """Extract assigned variable and constant names from code content"""
+        try:
+            # Methods are indented within their chunk
+            tree = ast.parse(textwrap.dedent(content))
+        except (SyntaxError, ValueError):
+            var_matches = _VAR_RE.findall(content)
+            const_matches = _CONST_RE.findall(content)
+            
+            # Filter out keywords and common patterns
+            variables = [v for v in var_matches if v not in _KEYWORDS and len(v) > 1]
+            constants = [c for c in const_matches if c not in _KEYWORDS and len(c) > 1]
+            
+            return variables, constants
         
-        # Simple regex patterns for Python
-        var_pattern = r'\b([a-z_][a-z0-9_]*)\s*='
-        const_pattern = r'\b([A-Z_][A-Z0-9_]*)\s*='
+        # Names bound by assignments, in source order; strings, comments, keyword
+        # arguments and comparisons are not assignments
+        targets = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign):
+                targets.extend(node.targets)
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                targets.append(node.target)
         
-        var_matches = re.findall(var_pattern, content)
-        const_matches = re.findall(const_pattern, content)
+        names = sorted(
+            (name.lineno, name.col_offset, name.id)
+            for target in targets
+            for name in ast.walk(target)
+            if isinstance(name, ast.Name) and isinstance(name.ctx, ast.Store) and len(name.id) > 1
+        )
         
-        # Filter out keywords and common patterns
-        keywords = {'if', 'for', 'while', 'with', 'def', 'class', 'import', 'from'}
-        variables = [v for v in var_matches if v not in keywords and len(v) > 1]
-        constants = [c for c in const_matches if c not in keywords and len(c) > 1]
+        variables, constants = [], []
+        for _, _, name in names:
+            (constants if _CONST_NAME_RE.fullmatch(name) else variables).append(name)
         
         return variables, constants
     
     def _analyze_formatting_patterns(self, chunks: List[CodeChunk]) -> Dict[str, Any]:
         """Analyze formatting patterns like indentation, spacing, etc."""
-        patterns = {
-            'indentation_style': Counter(),
-            'line_length': [],
-            'spacing_around_operators': Counter(),
-            'bracket_style': Counter()
-        }
+        if not chunks:
+            return {
+                'indentation': 'unknown',
+                'average_line_length': 0,
+                'max_line_length': 0,
+                'operator_spacing': 'unknown'
+            }
         
-        for chunk in chunks:
-            lines = chunk.content.split('\n')
-            
-            for line in lines:
-                # Analyze indentation
-                if line.startswith(' '):
-                    indent_size = len(line) - len(line.lstrip())
-                    if indent_size % 4 == 0:
-                        patterns['indentation_style']['spaces_4'] += 1
-                    elif indent_size % 2 == 0:
-                        patterns['indentation_style']['spaces_2'] += 1
-                elif line.startswith('\t'):
-                    patterns['indentation_style']['tabs'] += 1
-                
-                # Analyze line length
-                patterns['line_length'].append(len(line))
-                
-                # Analyze spacing around operators
-                if '=' in line and not line.strip().startswith('#'):
-                    if ' = ' in line:
-                        patterns['spacing_around_operators']['spaced'] += 1
-                    else:
-                        patterns['spacing_around_operators']['unspaced'] += 1
+        # Analyze all lines in one pass over the UTF-8 bytes of every chunk; the trailing
+        # NUL guarantees a non-whitespace byte after every line start
+        text = '\n'.join(chunk.content for chunk in chunks)
+        data = text.encode('utf-8')
+        buf = np.frombuffer(data + b'\0', dtype=np.uint8)
+        
+        newlines = np.flatnonzero(buf == ord('\n'))
+        line_starts = np.concatenate(([0], newlines + 1))
+        line_ends = np.concatenate((newlines, [len(data)]))
+        line_lengths = line_ends - line_starts
+        if not text.isascii():
+            # Count characters rather than bytes by discounting UTF-8 continuation bytes
+            continuation = np.flatnonzero((buf & 0xC0) == 0x80)
+            line_lengths -= self._count_per_line(continuation, line_starts)
+        
+        # First non-whitespace byte of each line, or the line end (ASCII whitespace is 9-13, 28-32).
+        # It always begins a run of non-whitespace, since the preceding byte is whitespace or none.
+        whitespace = ((buf - 9) < 5) | ((buf - 28) < 5)
+        run_starts = np.flatnonzero(~whitespace[1:] & whitespace[:-1]) + 1
+        if not whitespace[0]:
+            run_starts = np.concatenate(([0], run_starts))
+        first_non_space = np.minimum(run_starts[np.searchsorted(run_starts, line_starts)], line_ends)
+        
+        first_bytes = buf[line_starts]
+        indent_sizes = first_non_space - line_starts
+        comment_lines = (buf[first_non_space] == ord('#')) & (first_non_space < line_ends)
+        
+        # Lines whose indentation may continue with non-ASCII whitespace are measured exactly
+        for line in np.flatnonzero((buf[first_non_space] >= 0x80) & (first_non_space < line_ends)):
+            content = data[line_starts[line]:line_ends[line]].decode('utf-8')
+            stripped = content.lstrip()
+            indent_sizes[line] = len(content) - len(stripped)
+            comment_lines[line] = stripped.startswith('#')
+        
+        # Analyze indentation
+        space_indented = first_bytes == ord(' ')
+        indentation = np.select(
+            [space_indented & (indent_sizes % 4 == 0), space_indented & (indent_sizes % 2 == 0), first_bytes == ord('\t')],
+            [IndentationStyle.SPACES_4, IndentationStyle.SPACES_2, IndentationStyle.TABS],
+            0
+        )
+        
+        # Analyze spacing around operators on non-comment lines containing '='
+        equals = np.flatnonzero(buf == ord('='))
+        assignment_lines = self._count_per_line(equals, line_starts) > 0
+        # ' = ' only needs checking around each '='; the trailing NUL keeps equals + 1 in range
+        inner = equals[equals > 0]
+        spaced_positions = inner[(buf[inner - 1] == ord(' ')) & (buf[inner + 1] == ord(' '))]
+        spaced_lines = self._count_per_line(spaced_positions, line_starts) > 0
+        operator_spacing = np.where(assignment_lines & ~comment_lines, np.where(spaced_lines, OperatorSpacing.SPACED, OperatorSpacing.UNSPACED), 0)
         
         # Process results
         result = {
-            'indentation': patterns['indentation_style'].most_common(1)[0][0] if patterns['indentation_style'] else 'unknown',
-            'average_line_length': sum(patterns['line_length']) / len(patterns['line_length']) if patterns['line_length'] else 0,
-            'max_line_length': max(patterns['line_length']) if patterns['line_length'] else 0,
-            'operator_spacing': patterns['spacing_around_operators'].most_common(1)[0][0] if patterns['spacing_around_operators'] else 'unknown'
+            'indentation': self._most_common_label(indentation, IndentationStyle),
+            'average_line_length': int(line_lengths.sum()) / len(line_lengths),
+            'max_line_length': int(line_lengths.max()),
+            'operator_spacing': self._most_common_label(operator_spacing, OperatorSpacing)
         }
         
         return result
     
-    def _analyze_comment_patterns(self, chunks: List[CodeChunk]) -> Dict[str, str]:
-        """Analyze comment style and density"""
-        comment_patterns = {
-            'inline_comments': 0,
-            'block_comments': 0,
-            'docstrings': 0,
-            'total_lines': 0,
-            'comment_lines': 0
-        }
+    @staticmethod
+    def _count_per_line(positions: np.ndarray, line_starts: np.ndarray) -> np.ndarray:
+        """Number of the given byte positions falling on each line"""
+        line_numbers = np.searchsorted(line_starts, positions, side='right') - 1
+        return np.bincount(line_numbers, minlength=len(line_starts))
+    
+    @staticmethod
+    def _most_common_label(codes: np.ndarray, categories: Type[IntEnum]) -> str:
+        """Most frequent category among nonzero codes, ties going to the category seen first"""
+        counts = np.bincount(codes, minlength=len(categories) + 1)
+        best_count = counts[1:].max()
+        if not best_count:
+            return 'unknown'
         
-        for chunk in chunks:
-            lines = chunk.content.split('\n')
-            comment_patterns['total_lines'] += len(lines)
-            
-            for line in lines:
-                stripped = line.strip()
-                if stripped.startswith('#'):
-                    comment_patterns['comment_lines'] += 1
-                    if len(stripped) > 1 and stripped[1] == ' ':
-                        comment_patterns['inline_comments'] += 1
-                
-                # Check for docstrings (simplified)
-                if '"""' in line or "'''" in line:
-                    comment_patterns['docstrings'] += 1
+        tied = [category for category in categories if counts[category] == best_count]
+        best = min(tied, key=lambda category: np.argmax(codes == category)) if len(tied) > 1 else tied[0]
+        return best.name.lower()
+    
+    def _analyze_comment_patterns(self, tallies: StyleTallies) -> Dict[str, str]:
+        """Analyze comment style and density"""
+        comment_patterns = tallies.comments
         
         # Calculate comment density
         density = comment_patterns['comment_lines'] / comment_patterns['total_lines'] if comment_patterns['total_lines'] > 0 else 0
@@ -247,69 +522,18 @@ class CodeStyleAnalyzer:
             'comment_style': 'detailed' if comment_patterns['docstrings'] > 0 else 'simple'
         }
     
-    def _analyze_import_patterns(self, chunks: List[CodeChunk]) -> str:
+    def _analyze_import_patterns(self, tallies: StyleTallies) -> str:
         """Analyze import organization patterns"""
-        import_styles = Counter()
-        
-        for chunk in chunks:
-            if chunk.chunk_type == 'import':
-                content = chunk.content
-                
-                if 'import ' in content and ' as ' in content:
-                    import_styles['with_alias'] += 1
-                elif 'from ' in content and ' import ' in content:
-                    import_styles['from_import'] += 1
-                else:
-                    import_styles['direct_import'] += 1
-        
+        import_styles = tallies.import_styles
         return import_styles.most_common(1)[0][0] if import_styles else 'mixed'
     
-    def _analyze_error_handling_patterns(self, chunks: List[CodeChunk]) -> List[str]:
+    def _analyze_error_handling_patterns(self, tallies: StyleTallies) -> List[str]:
         """Analyze error handling patterns"""
-        error_patterns = []
-        
-        for chunk in chunks:
-            if chunk.language != 'python':
-                continue
-                
-            content = chunk.content
-            
-            # Check for try-except blocks
-            if 'try:' in content and 'except' in content:
-                error_patterns.append('try_except')
-            
-            # Check for raise statements
-            if 'raise ' in content:
-                error_patterns.append('raise_statements')
-            
-            # Check for assertions
-            if 'assert ' in content:
-                error_patterns.append('assertions')
-        
-        return list(set(error_patterns))
+        return list(tallies.error_patterns)
     
-    def _analyze_documentation_patterns(self, chunks: List[CodeChunk]) -> Dict[str, str]:
+    def _analyze_documentation_patterns(self, tallies: StyleTallies) -> Dict[str, str]:
         """Analyze documentation patterns"""
-        doc_patterns = {
-            'functions_with_docstrings': 0,
-            'classes_with_docstrings': 0,
-            'total_functions': 0,
-            'total_classes': 0
-        }
-        
-        for chunk in chunks:
-            if chunk.language != 'python':
-                continue
-                
-            if chunk.chunk_type == 'function':
-                doc_patterns['total_functions'] += 1
-                if '"""' in chunk.content or "'''" in chunk.content:
-                    doc_patterns['functions_with_docstrings'] += 1
-            
-            elif chunk.chunk_type == 'class':
-                doc_patterns['total_classes'] += 1
-                if '"""' in chunk.content or "'''" in chunk.content:
-                    doc_patterns['classes_with_docstrings'] += 1
+        doc_patterns = tallies.documentation
         
         # Calculate documentation coverage
         func_coverage = (doc_patterns['functions_with_docstrings'] / 
@@ -323,22 +547,20 @@ class CodeStyleAnalyzer:
             'class_documentation_coverage': 'high' if class_coverage > 0.8 else 'medium' if class_coverage > 0.5 else 'low'
         }
     
-    def _analyze_language_specific_patterns(self, chunks: List[CodeChunk]) -> Dict[str, Any]:
+    def _analyze_language_specific_patterns(self, tallies: StyleTallies) -> Dict[str, Any]:
         """Analyze language-specific patterns"""
-        language_patterns = defaultdict(dict)
-        
-        for chunk in chunks:
-            lang = chunk.language
-            if lang not in language_patterns:
-                language_patterns[lang] = {}
-            
+        # Each language reports the patterns of its last chunk, so only those are scanned
+        language_patterns = {}
+        for lang, chunk in tallies.last_chunks.items():
             # Language-specific analysis
             if lang == 'python':
                 language_patterns[lang] = self._analyze_python_patterns(chunk)
             elif lang in ['javascript', 'typescript']:
                 language_patterns[lang] = self._analyze_js_patterns(chunk)
+            else:
+                language_patterns[lang] = {}
         
-        return dict(language_patterns)
+        return language_patterns
     
     def _analyze_python_patterns(self, chunk: CodeChunk) -> Dict[str, Any]:
         """Analyze Python-specific patterns"""
@@ -360,8 +582,8 @@ class CodeStyleAnalyzer:
         }
         return patterns
     
-    async def _generate_style_profile(self, chunks: List[CodeChunk]) -> str:
-        """Generate overall style profile using LLM"""
+    async def _generate_style_profile(self, chunks: List[CodeChunk]) -> Optional[str]:
+        """Generate overall style profile using LLM; None if generation failed"""
         try:
             # Select representative samples
             sample_chunks = chunks[:10]  # Limit context size
@@ -386,7 +608,7 @@ Provide a 2-3 sentence summary that captures the essence of this codebase's styl
             
         except Exception as e:
             logger.error(f"Error generating style profile: {str(e)}")
-            return "Unable to generate style profile"
+            return None
     
     def _get_default_style_guidelines(self) -> StyleGuidelines:
         """Return default style guidelines when analysis fails"""
@@ -419,6 +641,10 @@ Provide a 2-3 sentence summary that captures the essence of this codebase's styl
     
     async def get_style_guidelines(self, language: Optional[str] = None) -> str:
         """Get formatted style guidelines for code generation"""
+        text_key = language or "default"
+        if text_key in self._guidelines_text_cache:
+            return self._guidelines_text_cache[text_key]
+        
         guidelines = await self.analyze_codebase_style()
         
         guidelines_text = f"""
@@ -435,8 +661,13 @@ Code Style Guidelines:
 
 Overall style profile: {guidelines.overall_style_profile}
 """
+        guidelines_text = guidelines_text.strip()
+        
+        # Default guidelines aren't cached so analysis is retried once code is indexed
+        if "codebase_style" in self.style_cache:
+            self._guidelines_text_cache[text_key] = guidelines_text
         
-        return guidelines_text.strip()
+        return guidelines_text
     
     async def analyze_file_style(self, file_path: str) -> Dict[str, Any]:
         """Analyze style patterns for a specific file"""
@@ -447,9 +678,11 @@ Overall style profile: {guidelines.overall_style_profile}
                 return {"error": "File not indexed"}
             
             # Analyze patterns
-            naming_patterns = self._analyze_naming_conventions(file_index.chunks)
+            memo = self._file_tallies.get(file_path)
+            tallies = memo[1] if memo and memo[0] is file_index else self._tally_chunks(file_index.chunks)
+            naming_patterns = self._analyze_naming_conventions(tallies)
             formatting_patterns = self._analyze_formatting_patterns(file_index.chunks)
-            comment_patterns = self._analyze_comment_patterns(file_index.chunks)
+            comment_patterns = self._analyze_comment_patterns(tallies)
             
             return {
                 "file_path": file_path,
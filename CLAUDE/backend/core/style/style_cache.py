@@ -0,0 +1,79 @@
+"""
+Style Cache Module
+
+Persists analyzed style guidelines in SQLite keyed by a hash of the indexed
+codebase, so a restart that re-indexes unchanged code skips re-analysis.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when StyleGuidelines changes so stale entries are never returned
+STYLE_CACHE_VERSION = 3
+
+class StyleCache:
+    """SQLite-backed cache of JSON-encoded style guidelines keyed by codebase hash"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, isolation_level=None, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS guidelines (key TEXT PRIMARY KEY, codebase_hash TEXT, blob BLOB)"
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def codebase_hash(file_states: Iterable[tuple]) -> str:
+        """Hash the (path, mtime, size, content hash) states of the indexed files"""
+        digest = hashlib.sha256(str(STYLE_CACHE_VERSION).encode("utf-8"))
+        for state in sorted(file_states, key=lambda s: s[0]):
+            digest.update(repr(state).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str, codebase_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the guideline fields stored under key if they were built from this codebase"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blob FROM guidelines WHERE key = ? AND codebase_hash = ?", (key, codebase_hash)
+            ).fetchone()
+
+        return orjson.loads(row[0]) if row else None
+
+    def put(self, key: str, codebase_hash: str, guidelines: Any):
+        """Store the guidelines (a dataclass or dict) for key, replacing those of an older codebase"""
+        blob = orjson.dumps(guidelines)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO guidelines (key, codebase_hash, blob) VALUES (?, ?, ?)",
+                (key, codebase_hash, blob)
+            )
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+def open_style_cache() -> Optional[StyleCache]:
+    """Open the configured style cache, or return None when disabled or unavailable"""
+    if not settings.enable_style_cache:
+        return None
+
+    try:
+        return StyleCache(settings.style_cache_path)
+    except Exception as e:
+        logger.error(f"Error opening style cache: {str(e)}")
+        return None
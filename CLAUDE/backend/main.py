@@ -7,7 +7,6 @@ Code-Library-Aware Unified Development Environment Backend
 
 import asyncio
 import logging
-import signal
 import sys
 from pathlib import Path
 
@@ -17,7 +16,7 @@ sys.path.insert(0, str(backend_dir))
 
 try:
     from config.settings import settings
-    from utils.helpers import setup_logging, ensure_directory_exists
+    from utils.helpers import setup_logging, ensure_directories_exist
     from api.server import app
     import uvicorn
 except ImportError as e:
@@ -26,6 +25,12 @@ except ImportError as e:
     print("pip install -r requirements.txt")
     sys.exit(1)
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Set up logging
 setup_logging(settings.log_level, settings.log_file)
 logger = logging.getLogger(__name__)
@@ -36,49 +41,49 @@ class CLAUDEBackend:
     def __init__(self):
         self.app = app
         self.server = None
-        self.should_shutdown = False
         
     async def startup(self):
         """Initialize the backend application"""
         logger.info("Starting CLAUDE Backend...")
         logger.info(f"Version: 0.1.0")
-        logger.info(f"Environment: {settings}")
+        # The settings repr is long; only build it when it will be logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Environment: {settings}")
         
-        # Ensure required directories exist
-        ensure_directory_exists(settings.vector_db_path)
-        ensure_directory_exists(settings.local_storage_path)
-        ensure_directory_exists(Path(settings.log_file).parent)
+        self._ensure_directories()
         
-        # Set up signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # SIGINT and SIGTERM are left to uvicorn: serve() installs its own
+        # loop handlers, which stop the server, and run() then calls shutdown()
         
         logger.info("CLAUDE Backend initialized successfully")
     
-    def _signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
-        logger.info(f"Received signal {signum}, shutting down...")
-        self.should_shutdown = True
+    def _ensure_directories(self):
+        """Ensure required directories exist"""
+        ensure_directories_exist((
+            settings.vector_db_path,
+            settings.local_storage_path,
+            str(Path(settings.log_file).parent)
+        ))
     
     async def run(self):
         """Run the backend server"""
         try:
             await self.startup()
             
-            # Start the server
-            logger.info(f"Starting server on {settings.api_host}:{settings.api_port}")
-            
             config = uvicorn.Config(
                 app=self.app,
                 host=settings.api_host,
                 port=settings.api_port,
                 reload=settings.api_reload,
+                http="httptools",
+                backlog=2048,
                 log_level=settings.log_level.lower()
             )
             
             self.server = uvicorn.Server(config)
             
             # Run the server
+            logger.info(f"Starting server on {settings.api_host}:{settings.api_port}")
             await self.server.serve()
             
         except KeyboardInterrupt:
@@ -89,6 +94,29 @@ class CLAUDEBackend:
         finally:
             await self.shutdown()
     
+    def run_workers(self):
+        """Run the server in worker processes under uvicorn's supervisor"""
+        # Only prepare the environment here; the supervisor handles signals and
+        # every worker builds its own components in the app's lifespan
+        logger.info("Starting CLAUDE Backend...")
+        self._ensure_directories()
+        
+        logger.warning(
+            f"Running {settings.api_workers} workers: each has its own index, watcher and caches, "
+            "so indexing through one worker is not visible to the others"
+        )
+        logger.info(f"Starting {settings.api_workers} workers on {settings.api_host}:{settings.api_port}")
+        uvicorn.run(
+            "api.server:app",
+            host=settings.api_host,
+            port=settings.api_port,
+            workers=settings.api_workers,
+            loop=settings.api_loop,
+            http="httptools",
+            backlog=2048,
+            log_level=settings.log_level.lower()
+        )
+    
     async def shutdown(self):
         """Shutdown the backend application"""
         logger.info("Shutting down CLAUDE Backend...")
@@ -103,6 +131,14 @@ def main():
     backend = CLAUDEBackend()
     
     try:
+        # Multiple workers only when explicitly configured (the default is one),
+        # and never with reload, which uvicorn can't combine with workers
+        if not settings.api_reload and settings.api_workers > 1:
+            backend.run_workers()
+            return
+        
+        if settings.api_loop == "uvloop" and UVLOOP_AVAILABLE:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
         asyncio.run(backend.run())
     except Exception as e:
         logger.error(f"Fatal error: {str(e)}")
@@ -7,24 +7,61 @@ like re-indexing modified files.
 
 import logging
 import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import threading
 import time
-from typing import Dict, List, Callable, Optional, Set
+from typing import Any, BinaryIO, Deque, Dict, Iterator, List, Callable, Optional, Set, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
-from threading import Thread
-import queue
 
 try:
     from watchdog.observers import Observer
     from watchdog.events import FileSystemEventHandler
     WATCHDOG_AVAILABLE = True
 except ImportError:
+    FileSystemEventHandler = object
     WATCHDOG_AVAILABLE = False
 
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# inotify(7) flags
+IN_MODIFY = 0x00000002
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = IN_CREATE | IN_MODIFY | IN_DELETE | IN_MOVED_TO | IN_DELETE_SELF | IN_ONLYDIR
+
+# Directories that never contain indexable sources
+_SKIPPED_DIRECTORIES = frozenset({'.git', 'node_modules', '__pycache__'})
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+_EVENT_HEADER = struct.Struct("iIII")
+
+try:
+    if not sys.platform.startswith("linux"):
+        raise OSError("inotify is Linux-only")
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    INOTIFY_AVAILABLE = True
+except (OSError, AttributeError):
+    INOTIFY_AVAILABLE = False
+
 @dataclass
 class FileChangeEvent:
     """Represents a file system change event"""
@@ -36,112 +73,310 @@ class FileChangeEvent:
 class CodebaseEventHandler(FileSystemEventHandler):
     """Handles file system events for codebase monitoring"""
     
-    def __init__(self, callback: Callable[[FileChangeEvent], None]):
+    def __init__(
+        self,
+        callback: Callable[[FileChangeEvent], None],
+        should_watch: Callable[[str], bool],
+        loop: asyncio.AbstractEventLoop
+    ):
         self.callback = callback
-        self.event_queue = queue.Queue()
-        self.debounce_time = 1.0  # Debounce events within 1 second
-        self.pending_events: Dict[str, float] = {}
-        self.debounce_task: Optional[asyncio.Task] = None
+        self.should_watch = should_watch
+        # watchdog calls the on_* handlers from its observer thread
+        self._loop = loop
+        self._queue = DedupWorkQueue(callback, loop)
     
     def on_created(self, event):
         """Handle file creation"""
-        if not event.is_directory:
+        if not event.is_directory and self.should_watch(event.src_path):
             self._enqueue_event("created", event.src_path)
     
     def on_modified(self, event):
         """Handle file modification"""
-        if not event.is_directory:
+        if not event.is_directory and self.should_watch(event.src_path):
             self._enqueue_event("modified", event.src_path)
     
     def on_deleted(self, event):
         """Handle file deletion"""
-        if not event.is_directory:
+        if not event.is_directory and self.should_watch(event.src_path):
             self._enqueue_event("deleted", event.src_path)
     
     def on_moved(self, event):
         """Handle file movement"""
-        if not event.is_directory:
+        if not event.is_directory and self.should_watch(event.dest_path):
             self._enqueue_event("moved", event.dest_path)
     
     def _enqueue_event(self, event_type: str, file_path: str):
-        """Enqueue event with debouncing"""
-        current_time = time.time()
-        
-        # Add to pending events
-        self.pending_events[file_path] = current_time
+        """Queue an event from another thread; events for the same file are coalesced"""
+        event = FileChangeEvent(event_type=event_type, file_path=file_path, timestamp=time.time())
+        self._loop.call_soon_threadsafe(self._queue.add, event)
+    
+    def add_event(self, event_type: str, file_path: str):
+        """Queue an event from the event loop's thread"""
+        self._queue.add(FileChangeEvent(event_type=event_type, file_path=file_path, timestamp=time.time()))
+
+class DedupWorkQueue:
+    """Coalesces file change events by path, delivering at most one per file per interval"""
+    
+    def __init__(
+        self,
+        callback: Callable[[FileChangeEvent], None],
+        loop: asyncio.AbstractEventLoop,
+        min_interval: float = 0.1
+    ):
+        self.callback = callback
+        self.loop = loop
+        self.min_interval = min_interval
+        # Latest undelivered event per file
+        self._pending: Dict[str, FileChangeEvent] = {}
+        # (due time, file) of each pending file; every file waits the same interval,
+        # so appending keeps it sorted and one timer for the head is enough
+        self._due: Deque[Tuple[float, str]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    def add(self, event: FileChangeEvent):
+        """Queue an event, replacing any undelivered event for the same file; call on the loop's thread"""
+        file_path = event.file_path
         
-        # Schedule debounce processing
-        if self.debounce_task is None or self.debounce_task.done():
-            loop = asyncio.get_event_loop()
-            self.debounce_task = loop.create_task(self._process_pending_events())
-    
-    async def _process_pending_events(self):
-        """Process pending events with debouncing"""
-        await asyncio.sleep(self.debounce_time)
+        # A burst of writes to one file is delivered once, as its latest event
+        if file_path not in self._pending:
+            self._due.append((self.loop.time() + self.min_interval, file_path))
+            if self._timer is None:
+                self._timer = self.loop.call_at(self._due[0][0], self._deliver_due)
         
-        current_time = time.time()
-        expired_events = [
-            path for path, timestamp in self.pending_events.items()
-            if current_time - timestamp >= self.debounce_time
-        ]
+        self._pending[file_path] = event
+    
+    def _deliver_due(self):
+        """Pass the latest event of each file whose interval has elapsed to the callback"""
+        self._timer = None
+        now = self.loop.time()
         
-        for file_path in expired_events:
-            # Create event (use "modified" as default for debounced events)
-            event = FileChangeEvent(
-                event_type="modified",
-                file_path=file_path,
-                timestamp=current_time
-            )
+        while self._due and self._due[0][0] <= now:
+            _, file_path = self._due.popleft()
+            event = self._pending.pop(file_path)
             
-            # Call callback
             try:
                 self.callback(event)
             except Exception as e:
                 logger.error(f"Error in file change callback: {str(e)}")
+        
+        if self._due:
+            self._timer = self.loop.call_at(self._due[0][0], self._deliver_due)
+
+class _InotifyBackend:
+    """Delivers file events from one inotify descriptor read on the event loop"""
+    
+    # Room for hundreds of events per read() instead of one callback per event
+    READ_SIZE = 65536
+    # Seconds between reads; the kernel merges repeated events queued meanwhile
+    READ_PAUSE = 0.05
+    
+    def __init__(
+        self,
+        dispatch: Callable[[str, str], None],
+        loop: asyncio.AbstractEventLoop,
+        extensions: Set[str]
+    ):
+        self.dispatch = dispatch
+        self.loop = loop
+        # Events for other files are dropped before any path or event object is built
+        self.extensions = frozenset(extension.encode() for extension in extensions)
+        self.fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        # Watch descriptor -> watched directory; trees are also added from other threads
+        self.watches: Dict[int, str] = {}
+        self._watches_lock = threading.Lock()
+        self._resume_handle: Optional[asyncio.TimerHandle] = None
+    
+    def add_tree(self, directory: str, report_files: bool = False):
+        """Watch a directory and its subdirectories, optionally reporting the files already in them"""
+        stack = [directory]
+        while stack:
+            path = stack.pop()
+            wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+            if wd < 0:
+                logger.warning(f"Cannot watch directory {path}: {os.strerror(ctypes.get_errno())}")
+                continue
+            with self._watches_lock:
+                self.watches[wd] = path
             
-            # Remove from pending
-            del self.pending_events[file_path]
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _SKIPPED_DIRECTORIES:
+                                stack.append(entry.path)
+                        elif report_files and self._is_source(os.fsencode(entry.name)):
+                            self.dispatch("created", entry.path)
+            except OSError as e:
+                logger.warning(f"Cannot scan directory {path}: {str(e)}")
+    
+    def remove_tree(self, directory: str):
+        """Stop watching a directory and its subdirectories"""
+        prefix = os.path.join(directory, "")
+        with self._watches_lock:
+            removed = [wd for wd, path in self.watches.items() if path == directory or path.startswith(prefix)]
+            for wd in removed:
+                del self.watches[wd]
+        
+        # The kernel queues IN_IGNORED for each; those find no watch and are dropped
+        for wd in removed:
+            _libc.inotify_rm_watch(self.fd, wd)
+    
+    def start(self):
+        """Start reading events on the event loop"""
+        self._call_on_loop(lambda: self.loop.add_reader(self.fd, self._drain))
+    
+    def close(self):
+        """Stop reading events and release the descriptor and its watches"""
+        def close_fd():
+            if self._resume_handle:
+                self._resume_handle.cancel()
+            self.loop.remove_reader(self.fd)
+            os.close(self.fd)
+        
+        self._call_on_loop(close_fd)
+        self.watches.clear()
+    
+    def _call_on_loop(self, callback: Callable[[], Any]):
+        """Run callback on the event loop, which may be running in another thread"""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        
+        if running_loop is self.loop:
+            callback()
+        else:
+            self.loop.call_soon_threadsafe(callback)
+    
+    def _drain(self):
+        """Read a batch of queued events and dispatch them"""
+        try:
+            buf = os.read(self.fd, self.READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.error(f"Error reading inotify events: {str(e)}")
+            return
+        
+        offset = 0
+        header_size = _EVENT_HEADER.size
+        while offset < len(buf):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+            name = buf[offset + header_size:offset + header_size + length].rstrip(b"\0")
+            offset += header_size + length
+            self._handle_event(wd, mask, name)
+        
+        # Under a write storm the kernel merges each repeated event into the last
+        # unread one, so pausing between reads caps the events we have to handle
+        self.loop.remove_reader(self.fd)
+        self._resume_handle = self.loop.call_later(self.READ_PAUSE, self._resume)
+    
+    def _resume(self):
+        """Resume reading events after a pause"""
+        self._resume_handle = None
+        self.loop.add_reader(self.fd, self._drain)
+    
+    def _handle_event(self, wd: int, mask: int, name: bytes):
+        """Translate one inotify event into a dispatched change"""
+        if mask & IN_Q_OVERFLOW:
+            logger.warning("inotify event queue overflowed, some file changes were missed")
+            return
+        
+        if mask & IN_IGNORED:
+            with self._watches_lock:
+                self.watches.pop(wd, None)
+            return
+        
+        directory = self.watches.get(wd)
+        if directory is None or not name:
+            return
+        
+        if mask & IN_ISDIR:
+            # New subdirectories are watched too; files created before the watch are reported
+            if mask & (IN_CREATE | IN_MOVED_TO) and os.fsdecode(name) not in _SKIPPED_DIRECTORIES:
+                self.add_tree(os.path.join(directory, os.fsdecode(name)), report_files=True)
+            return
+        
+        if not self._is_source(name):
+            return
+        
+        path = os.path.join(directory, os.fsdecode(name))
+        if mask & IN_CREATE:
+            self.dispatch("created", path)
+        elif mask & IN_MODIFY:
+            self.dispatch("modified", path)
+        elif mask & IN_DELETE:
+            self.dispatch("deleted", path)
+        elif mask & IN_MOVED_TO:
+            self.dispatch("moved", path)
+    
+    def _is_source(self, name: bytes) -> bool:
+        """Check a file name against the watched extensions"""
+        dot = name.rfind(b".")
+        return dot > 0 and name[dot:].lower() in self.extensions
 
 class FileWatcher:
     """Monitors file system changes in codebase directories"""
     
+    # Supported file extensions, lowercase
+    supported_extensions = frozenset({
+        '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go',
+        '.rs', '.php', '.rb', '.swift', '.kt', '.cs', '.h', '.hpp'
+    })
+    
     def __init__(self, watch_directories: Optional[List[str]] = None):
-        if not WATCHDOG_AVAILABLE:
-            raise ImportError("watchdog library is required for file monitoring")
+        if not INOTIFY_AVAILABLE and not WATCHDOG_AVAILABLE:
+            raise ImportError("watchdog library is required for file monitoring without inotify")
         
-        self.watch_directories = watch_directories or settings.watch_directories
-        self.observer = Observer()
+        self.watch_directories = list(watch_directories or settings.watch_directories)
+        self.resolved_directories: Set[Path] = {Path(d).resolve() for d in self.watch_directories}
+        # inotify is read on the event loop; watchdog's threaded observer is the fallback
+        self.observer = None if INOTIFY_AVAILABLE else Observer()
+        self.inotify: Optional[_InotifyBackend] = None
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
         self.event_handlers: List[CodebaseEventHandler] = []
-        self.change_callbacks: List[Callable[[FileChangeEvent], None]] = []
+        # Replaced rather than mutated, so events iterate a stable snapshot
+        self.change_callbacks: Tuple[Callable[[FileChangeEvent], None], ...] = ()
+        self._callbacks_lock = threading.Lock()
         self.is_running = False
         self.watched_paths: Set[str] = set()
-        
-        # Supported file extensions
-        self.supported_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go',
-            '.rs', '.php', '.rb', '.swift', '.kt', '.cs', '.h', '.hpp'
-        }
+        # watchdog watch per watched directory, for unscheduling it
+        self.observed_watches: Dict[str, Any] = {}
+        # Directories can be added and removed from API threads while running
+        self._directories_lock = threading.Lock()
+        # Built on demand and dropped whenever anything it reports changes
+        self._stats_cache: Optional[Dict[str, Any]] = None
     
     def add_change_callback(self, callback: Callable[[FileChangeEvent], None]):
         """Add callback for file change events"""
-        self.change_callbacks.append(callback)
+        with self._callbacks_lock:
+            self.change_callbacks = self.change_callbacks + (callback,)
+            self._stats_cache = None
     
     def remove_change_callback(self, callback: Callable[[FileChangeEvent], None]):
         """Remove callback for file change events"""
-        if callback in self.change_callbacks:
-            self.change_callbacks.remove(callback)
+        with self._callbacks_lock:
+            if callback in self.change_callbacks:
+                callbacks = list(self.change_callbacks)
+                callbacks.remove(callback)
+                self.change_callbacks = tuple(callbacks)
+                self._stats_cache = None
     
     def _should_watch_file(self, file_path: str) -> bool:
         """Check if file should be watched based on extension"""
-        return Path(file_path).suffix.lower() in self.supported_extensions
+        # Slice the suffix off the string instead of building a Path per event
+        dot = file_path.rfind('.')
+        return dot > 0 and file_path[dot - 1] not in '/\\' and file_path[dot:].lower() in self.supported_extensions
     
     def _handle_file_change(self, event: FileChangeEvent):
-        """Handle file change event"""
-        # Only process supported file types
-        if not self._should_watch_file(event.file_path):
-            return
-        
-        logger.debug(f"File {event.event_type}: {event.file_path}")
+        """Handle file change event; only supported file types reach this point"""
+        logger.debug("File %s: %s", event.event_type, event.file_path)
         
         # Call all registered callbacks
         for callback in self.change_callbacks:
@@ -158,26 +393,25 @@ class FileWatcher:
         
         try:
             # Create event handler
-            event_handler = CodebaseEventHandler(self._handle_file_change)
+            # Events are delivered on the loop the watcher was created on
+            loop = self.loop or asyncio.get_running_loop()
+            event_handler = CodebaseEventHandler(self._handle_file_change, self._should_watch_file, loop)
             self.event_handlers.append(event_handler)
             
+            if INOTIFY_AVAILABLE:
+                self.inotify = _InotifyBackend(event_handler.add_event, loop, self.supported_extensions)
+            
             # Add watches for each directory
             for directory in self.watch_directories:
-                directory_path = Path(directory)
-                if directory_path.exists():
-                    self.observer.schedule(
-                        event_handler,
-                        str(directory_path),
-                        recursive=True
-                    )
-                    self.watched_paths.add(str(directory_path))
-                    logger.info(f"Watching directory: {directory}")
-                else:
-                    logger.warning(f"Directory not found: {directory}")
+                self._watch_directory(directory)
             
-            # Start observer
-            self.observer.start()
+            # Start reading events
+            if self.inotify:
+                self.inotify.start()
+            else:
+                self.observer.start()
             self.is_running = True
+            self._stats_cache = None
             
             logger.info(f"File watcher started, monitoring {len(self.watched_paths)} directories")
             
@@ -191,103 +425,208 @@ class FileWatcher:
             return
         
         try:
-            self.observer.stop()
-            self.observer.join()
+            if self.inotify:
+                self.inotify.close()
+                self.inotify = None
+            else:
+                self.observer.stop()
+                self.observer.join()
             self.is_running = False
             self.watched_paths.clear()
+            self.observed_watches.clear()
             self.event_handlers.clear()
+            self._stats_cache = None
             
             logger.info("File watcher stopped")
             
         except Exception as e:
             logger.error(f"Error stopping file watcher: {str(e)}")
     
-    def add_watch_directory(self, directory: str):
-        """Add a new directory to watch"""
-        if self.is_running:
-            logger.warning("Cannot add directory while watcher is running")
+    def _watch_directory(self, directory: str):
+        """Add watches for a directory tree"""
+        directory_path = Path(directory)
+        if not directory_path.exists():
+            logger.warning(f"Directory not found: {directory}")
             return
         
-        if directory not in self.watch_directories:
-            self.watch_directories.append(directory)
-            logger.info(f"Added watch directory: {directory}")
+        if self.inotify:
+            self.inotify.add_tree(str(directory_path))
+        else:
+            self.observed_watches[str(directory_path)] = self.observer.schedule(
+                self.event_handlers[0],
+                str(directory_path),
+                recursive=True
+            )
+        self.watched_paths.add(str(directory_path))
+        self._stats_cache = None
+        logger.info(f"Watching directory: {directory}")
+    
+    def _unwatch_directory(self, directory: str):
+        """Remove the watches of a directory tree"""
+        directory_path = str(Path(directory))
+        if directory_path not in self.watched_paths:
+            return
+        
+        if self.inotify:
+            self.inotify.remove_tree(directory_path)
+        else:
+            watch = self.observed_watches.pop(directory_path, None)
+            if watch is not None:
+                self.observer.unschedule(watch)
+        self.watched_paths.discard(directory_path)
+        self._stats_cache = None
+    
+    def add_watch_directory(self, directory: str):
+        """Add a new directory to watch, starting to watch it if the watcher is running"""
+        with self._directories_lock:
+            # Compare canonical paths so ./x, x/ and /abs/x are the same directory
+            resolved = Path(directory).resolve()
+            if resolved not in self.resolved_directories:
+                self.resolved_directories.add(resolved)
+                self.watch_directories.append(directory)
+                self._stats_cache = None
+                if self.is_running:
+                    self._watch_directory(directory)
+                logger.info(f"Added watch directory: {directory}")
     
     def remove_watch_directory(self, directory: str):
-        """Remove a directory from watch list"""
-        if directory in self.watch_directories:
-            self.watch_directories.remove(directory)
-            logger.info(f"Removed watch directory: {directory}")
+        """Remove a directory from watch list, dropping its watches if the watcher is running"""
+        with self._directories_lock:
+            resolved = Path(directory).resolve()
+            if resolved in self.resolved_directories:
+                self.resolved_directories.discard(resolved)
+                removed = [d for d in self.watch_directories if Path(d).resolve() == resolved]
+                self.watch_directories = [d for d in self.watch_directories if Path(d).resolve() != resolved]
+                self._stats_cache = None
+                if self.is_running:
+                    for removed_directory in removed:
+                        self._unwatch_directory(removed_directory)
+                logger.info(f"Removed watch directory: {directory}")
     
     def get_watched_directories(self) -> List[str]:
         """Get list of currently watched directories"""
         return list(self.watched_paths)
     
     def get_watcher_stats(self) -> Dict[str, Any]:
-        """Get file watcher statistics"""
-        return {
-            "is_running": self.is_running,
-            "watched_directories": list(self.watched_paths),
-            "configured_directories": self.watch_directories,
-            "supported_extensions": list(self.supported_extensions),
-            "registered_callbacks": len(self.change_callbacks)
-        }
+        """Get file watcher statistics; the returned dict is shared and must not be modified"""
+        stats = self._stats_cache
+        if stats is None:
+            stats = {
+                "is_running": self.is_running,
+                "backend": "inotify" if INOTIFY_AVAILABLE else "watchdog",
+                "watched_directories": list(self.watched_paths),
+                "configured_directories": list(self.watch_directories),
+                "supported_extensions": list(self.supported_extensions),
+                "registered_callbacks": len(self.change_callbacks)
+            }
+            self._stats_cache = stats
+        
+        return stats
+
+def _iter_nul_records(stream: BinaryIO, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yield the NUL-terminated records of a binary stream as they arrive"""
+    tail = b''
+    while True:
+        chunk = stream.read1(chunk_size)
+        if not chunk:
+            break
+        records = (tail + chunk).split(b'\0')
+        tail = records.pop()
+        yield from records
+    
+    if tail:
+        yield tail
 
 class GitIntegration:
     """Git integration for version control hooks"""
     
+    # Seconds a git status result is reused; work tree edits don't touch the index, so
+    # watched source changes invalidate it sooner through invalidate_status()
+    STATUS_TTL = 5.0
+    
     def __init__(self, codebase_root: str):
         self.codebase_root = Path(codebase_root)
         self.git_dir = self.codebase_root / '.git'
+        # (expires_at, index mtime, (staged, modified)) of the last git status
+        self._status_cache: Optional[Tuple[float, Optional[int], Tuple[List[str], List[str]]]] = None
+        self._status_lock = threading.Lock()
+        # Bumped on invalidation so a status started before a change isn't cached
+        self._status_generation = 0
+        # Checked once; call refresh_repo_state() if the codebase becomes a repository later
+        self._is_repo = self.git_dir.exists()
     
     def is_git_repository(self) -> bool:
         """Check if current directory is a git repository"""
-        return self.git_dir.exists()
+        return self._is_repo
+    
+    def refresh_repo_state(self) -> bool:
+        """Re-check whether the codebase is a git repository"""
+        self._is_repo = self.git_dir.exists()
+        return self._is_repo
     
     def get_staged_files(self) -> List[str]:
         """Get list of staged files"""
-        if not self.is_git_repository():
-            return []
-        
-        try:
-            import subprocess
-            result = subprocess.run(
-                ['git', 'diff', '--cached', '--name-only'],
-                cwd=self.codebase_root,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                return result.stdout.strip().split('\n')
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error getting staged files: {str(e)}")
-            return []
+        return list(self._git_status()[0])
     
     def get_modified_files(self) -> List[str]:
         """Get list of modified files"""
+        return list(self._git_status()[1])
+    
+    def _git_status(self) -> Tuple[List[str], List[str]]:
+        """Get the staged and modified files from one git status, reused briefly while the index is unchanged"""
         if not self.is_git_repository():
-            return []
+            return [], []
         
-        try:
-            import subprocess
-            result = subprocess.run(
-                ['git', 'diff', '--name-only'],
-                cwd=self.codebase_root,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                return result.stdout.strip().split('\n')
+        with self._status_lock:
+            try:
+                index_mtime = (self.git_dir / 'index').stat().st_mtime_ns
+            except OSError:
+                index_mtime = None
             
-            return []
+            cached = self._status_cache
+            if cached and cached[0] > time.monotonic() and cached[1] == index_mtime:
+                return cached[2]
             
-        except Exception as e:
-            logger.error(f"Error getting modified files: {str(e)}")
-            return []
+            generation = self._status_generation
+            try:
+                import subprocess
+                process = subprocess.Popen(
+                    ['git', 'status', '--porcelain=v1', '-z', '--no-renames', '--untracked-files=no'],
+                    cwd=self.codebase_root,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+                
+                # NUL-terminated "XY path" entries, parsed while git is still writing;
+                # X is the index state, Y the work tree state
+                staged, modified = [], []
+                with process:
+                    for entry in _iter_nul_records(process.stdout):
+                        if len(entry) < 4:
+                            continue
+                        path = os.fsdecode(entry[3:])
+                        if entry[0:1] in b'MADRCT':
+                            staged.append(path)
+                        if entry[1:2] in b'MDT':
+                            modified.append(path)
+                
+                if process.returncode != 0:
+                    return [], []
+                
+                status = (staged, modified)
+                if generation == self._status_generation:
+                    self._status_cache = (time.monotonic() + self.STATUS_TTL, index_mtime, status)
+                return status
+                
+            except Exception as e:
+                logger.error(f"Error getting git status: {str(e)}")
+                return [], []
+    
+    def invalidate_status(self):
+        """Drop the cached git status, e.g. after a file in the work tree changed"""
+        # No lock: this runs on the event loop while a status may hold it for a while
+        self._status_generation += 1
+        self._status_cache = None
     
     def setup_git_hooks(self) -> bool:
         """Set up git hooks for automatic indexing"""
@@ -329,18 +668,33 @@ class MonitoringManager:
         self.codebase_root = codebase_root
         self.file_watcher = FileWatcher()
         self.git_integration = GitIntegration(codebase_root)
-        self.change_callbacks: List[Callable[[FileChangeEvent], None]] = []
+        # Replaced rather than mutated, so events iterate a stable snapshot
+        self.change_callbacks: Tuple[Callable[[FileChangeEvent], None], ...] = ()
+        self._callbacks_lock = threading.Lock()
+        # Runs callbacks while monitoring; one thread keeps them in event order
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # (watcher stats, is repository, stats) of the last get_monitoring_stats
+        self._stats_cache: Optional[Tuple[Dict[str, Any], bool, Dict[str, Any]]] = None
         
         # Set up default callback
         self.file_watcher.add_change_callback(self._handle_file_change)
     
     def add_change_callback(self, callback: Callable[[FileChangeEvent], None]):
         """Add callback for file change events"""
-        self.change_callbacks.append(callback)
+        with self._callbacks_lock:
+            self.change_callbacks = self.change_callbacks + (callback,)
     
     def _handle_file_change(self, event: FileChangeEvent):
         """Handle file change event"""
-        # Forward to all registered callbacks
+        self.git_integration.invalidate_status()
+        
+        # A slow callback must not hold up event delivery on the event loop
+        executor = self._executor
+        if executor is not None:
+            executor.submit(self._run_callbacks, event)
+    
+    def _run_callbacks(self, event: FileChangeEvent):
+        """Forward an event to all registered callbacks"""
         for callback in self.change_callbacks:
             try:
                 callback(event)
@@ -350,6 +704,9 @@ class MonitoringManager:
     def start_monitoring(self):
         """Start all monitoring components"""
         try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="claude-monitoring")
+            
             # Start file watcher
             self.file_watcher.start_watching()
             
@@ -367,20 +724,35 @@ class MonitoringManager:
         """Stop all monitoring components"""
         try:
             self.file_watcher.stop_watching()
+            
+            executor, self._executor = self._executor, None
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            
             logger.info("Monitoring stopped")
         except Exception as e:
             logger.error(f"Error stopping monitoring: {str(e)}")
     
     def get_monitoring_stats(self) -> Dict[str, Any]:
-        """Get comprehensive monitoring statistics"""
-        return {
-            "file_watcher": self.file_watcher.get_watcher_stats(),
+        """Get comprehensive monitoring statistics; the returned dict is shared and must not be modified"""
+        watcher_stats = self.file_watcher.get_watcher_stats()
+        is_repo = self.git_integration.is_git_repository()
+        
+        # Rebuilt only when the watcher's stats or the repository state changed
+        cached = self._stats_cache
+        if cached and cached[0] is watcher_stats and cached[1] == is_repo:
+            return cached[2]
+        
+        stats = {
+            "file_watcher": watcher_stats,
             "git_integration": {
-                "is_git_repository": self.git_integration.is_git_repository(),
-                "git_dir_exists": self.git_integration.git_dir.exists()
+                "is_git_repository": is_repo,
+                "git_dir_exists": is_repo
             },
             "codebase_root": str(self.codebase_root)
         }
+        self._stats_cache = (watcher_stats, is_repo, stats)
+        return stats
     
     def add_watch_directory(self, directory: str):
         """Add directory to watch list"""
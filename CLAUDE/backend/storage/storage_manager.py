@@ -5,17 +5,49 @@ Provides unified storage interface for local and cloud storage.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Union
+from typing import BinaryIO, Deque, Dict, Iterator, List, Any, Optional, Tuple, Union
 from pathlib import Path
-import json
 import asyncio
+import base64
+import os
+import stat
+import struct
+import tempfile
+import time
 from abc import ABC, abstractmethod
+from collections import Counter, deque
+from itertools import islice
 from dataclasses import dataclass
 
+import orjson
+
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Saved items are one file: this header, the item's metadata, then its content.
+# Files without the magic (written before the format or by other tools) are
+# plain content with an optional ".meta" sidecar.
+_ITEM_HEADER = struct.Struct("<4sBBHI")  # magic, version, flags, reserved, metadata length
+_ITEM_MAGIC = b"\x89CLI"
+_ITEM_VERSION = 1
+_ITEM_FLAG_TEXT = 0x01
+
+def _dump_metadata(metadata: Dict[str, Any]) -> bytes:
+    """Encode item metadata; non-string keys become strings as they did with json"""
+    return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS)
+
+def _parse_item_header(data: bytes) -> Optional[Tuple[int, int]]:
+    """Return (flags, metadata length) if data starts with an item header"""
+    if len(data) < _ITEM_HEADER.size:
+        return None
+    
+    magic, version, flags, _, metadata_length = _ITEM_HEADER.unpack_from(data)
+    if magic != _ITEM_MAGIC or version != _ITEM_VERSION:
+        return None
+    
+    return flags, metadata_length
+
 @dataclass
 class StorageItem:
     """Represents a storage item"""
@@ -62,6 +94,14 @@ class StorageInterface(ABC):
     async def set_metadata(self, path: str, metadata: Dict[str, Any]) -> bool:
         """Set metadata for item"""
         pass
+    
+    async def load_many(self, paths: List[str]) -> List[Optional[Union[str, bytes]]]:
+        """Load several items; backends that can batch I/O override this"""
+        return [await self.load(path) for path in paths]
+    
+    async def save_many(self, items: List[Tuple[str, Union[str, bytes], Optional[Dict[str, Any]]]]) -> List[bool]:
+        """Save several (path, content, metadata) items; backends that can batch I/O override this"""
+        return [await self.save(path, content, metadata) for path, content, metadata in items]
 
 class LocalStorage(StorageInterface):
     """Local file system storage implementation"""
@@ -69,10 +109,18 @@ class LocalStorage(StorageInterface):
     def __init__(self, base_path: Optional[str] = None):
         self.base_path = Path(base_path or settings.local_storage_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # (path, recursive) -> (expires_at, items); dropped whenever this instance writes
+        self._list_cache: Dict[Tuple[str, bool], Tuple[float, List[StorageItem]]] = {}
+        self._list_generation = 0
         logger.info(f"Local storage initialized at {self.base_path}")
     
+    def _invalidate_list_cache(self):
+        """Forget cached listings after a write"""
+        self._list_generation += 1
+        self._list_cache.clear()
+    
     def _get_full_path(self, path: str) -> Path:
-        """Get full path from relative path"""
+        """Get full path from relative path; creates the parent, so call it from a worker thread"""
         full_path = self.base_path / path
         full_path.parent.mkdir(parents=True, exist_ok=True)
         return full_path
@@ -80,17 +128,10 @@ class LocalStorage(StorageInterface):
     async def save(self, path: str, content: Union[str, bytes], metadata: Optional[Dict[str, Any]] = None) -> bool:
         """Save content to local storage"""
         try:
-            full_path = self._get_full_path(path)
-            
-            if isinstance(content, str):
-                full_path.write_text(content, encoding='utf-8')
-            else:
-                full_path.write_bytes(content)
-            
-            # Save metadata if provided
-            if metadata:
-                metadata_path = full_path.with_suffix(full_path.suffix + '.meta')
-                metadata_path.write_text(json.dumps(metadata), encoding='utf-8')
+            try:
+                await asyncio.to_thread(self._save_sync, path, content, metadata)
+            finally:
+                self._invalidate_list_cache()
             
             logger.debug(f"Saved content to {path}")
             return True
@@ -99,128 +140,353 @@ class LocalStorage(StorageInterface):
             logger.error(f"Error saving to local storage: {str(e)}")
             return False
     
-    async def load(self, path: str) -> Optional[Union[str, bytes]]:
-        """Load content from local storage"""
+    def _save_sync(self, path: str, content: Union[str, bytes], metadata: Optional[Dict[str, Any]]):
+        """Write an item with its metadata in a single file; runs in a worker thread"""
+        full_path = self._get_full_path(path)
+        metadata_path = full_path.with_suffix(full_path.suffix + '.meta')
+        
+        # Saving without metadata keeps what the item already had
+        if metadata:
+            encoded = _dump_metadata(metadata)
+        else:
+            encoded = self._read_stored_metadata(full_path, metadata_path)
+        
+        self._write_item(full_path, content, encoded)
+        
+        # The header now holds the metadata, so a sidecar would be stale
         try:
-            full_path = self._get_full_path(path)
-            
-            if not full_path.exists():
-                return None
-            
-            # Try to detect if it's text or binary
+            metadata_path.unlink()
+        except FileNotFoundError:
+            pass
+    
+    @staticmethod
+    def _read_stored_metadata(full_path: Path, metadata_path: Path) -> bytes:
+        """Return an item's encoded metadata from its header or sidecar, or b"" if it has none"""
+        try:
+            with open(full_path, 'rb') as f:
+                parsed = _parse_item_header(f.read(_ITEM_HEADER.size))
+                if parsed is not None:
+                    return f.read(parsed[1])
+        except (FileNotFoundError, IsADirectoryError):
+            pass
+        
+        try:
+            return metadata_path.read_bytes()
+        except FileNotFoundError:
+            return b""
+    
+    @staticmethod
+    def _write_item(full_path: Path, content: Union[str, bytes], metadata: bytes):
+        """Write the header, encoded metadata and content of an item in one write"""
+        if isinstance(content, str):
+            flags, data = _ITEM_FLAG_TEXT, content.encode('utf-8')
+        else:
+            flags, data = 0, content
+        
+        header = _ITEM_HEADER.pack(_ITEM_MAGIC, _ITEM_VERSION, flags, 0, len(metadata))
+        full_path.write_bytes(header + metadata + data)
+    
+    @staticmethod
+    def _read_item(full_path: Path) -> Tuple[Union[str, bytes], Optional[bytes]]:
+        """Read an item's content and encoded metadata; metadata is None for plain files"""
+        data = full_path.read_bytes()
+        
+        parsed = _parse_item_header(data)
+        if parsed is None:
+            # Plain file: text if it decodes, with newlines translated as read_text did
             try:
-                return full_path.read_text(encoding='utf-8')
+                text = data.decode('utf-8')
             except UnicodeDecodeError:
-                return full_path.read_bytes()
-                
+                return data, None
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text, None
+        
+        flags, metadata_length = parsed
+        content_start = _ITEM_HEADER.size + metadata_length
+        metadata = data[_ITEM_HEADER.size:content_start]
+        
+        if flags & _ITEM_FLAG_TEXT:
+            return str(memoryview(data)[content_start:], 'utf-8'), metadata
+        return data[content_start:], metadata
+    
+    async def load(self, path: str) -> Optional[Union[str, bytes]]:
+        """Load content from local storage"""
+        try:
+            return await asyncio.to_thread(self._load_sync, path)
         except Exception as e:
             logger.error(f"Error loading from local storage: {str(e)}")
             return None
     
+    def _load_sync(self, path: str) -> Optional[Union[str, bytes]]:
+        """Read a stored item's content; runs in a worker thread"""
+        try:
+            return self._read_item(self._get_full_path(path))[0]
+        except FileNotFoundError:
+            return None
+    
+    async def load_many(self, paths: List[str]) -> List[Optional[Union[str, bytes]]]:
+        """Load several items from local storage in one worker thread call"""
+        return await asyncio.to_thread(self._load_many_sync, paths)
+    
+    def _load_many_sync(self, paths: List[str]) -> List[Optional[Union[str, bytes]]]:
+        """Read a batch of stored files; a file that fails to load yields None"""
+        contents = []
+        for path in paths:
+            try:
+                contents.append(self._load_sync(path))
+            except Exception as e:
+                logger.error(f"Error loading from local storage: {str(e)}")
+                contents.append(None)
+        return contents
+    
+    async def save_many(self, items: List[Tuple[str, Union[str, bytes], Optional[Dict[str, Any]]]]) -> List[bool]:
+        """Save several items to local storage in one worker thread call"""
+        try:
+            return await asyncio.to_thread(self._save_many_sync, items)
+        finally:
+            self._invalidate_list_cache()
+    
+    def _save_many_sync(self, items: List[Tuple[str, Union[str, bytes], Optional[Dict[str, Any]]]]) -> List[bool]:
+        """Write a batch of items; reports per item whether it was saved"""
+        results = []
+        for path, content, metadata in items:
+            try:
+                self._save_sync(path, content, metadata)
+                results.append(True)
+            except Exception as e:
+                logger.error(f"Error saving to local storage: {str(e)}")
+                results.append(False)
+        return results
+    
     async def delete(self, path: str) -> bool:
         """Delete item from local storage"""
         try:
-            full_path = self._get_full_path(path)
+            try:
+                deleted = await asyncio.to_thread(self._delete_sync, path)
+            finally:
+                self._invalidate_list_cache()
             
-            if full_path.exists():
-                full_path.unlink()
-                
-                # Delete metadata file if it exists
-                metadata_path = full_path.with_suffix(full_path.suffix + '.meta')
-                if metadata_path.exists():
-                    metadata_path.unlink()
-                
+            if deleted:
                 logger.debug(f"Deleted {path}")
-                return True
-            
-            return False
+            return deleted
             
         except Exception as e:
             logger.error(f"Error deleting from local storage: {str(e)}")
             return False
     
+    def _delete_sync(self, path: str) -> bool:
+        """Remove a stored file and its metadata; runs in a worker thread"""
+        full_path = self._get_full_path(path)
+        
+        if not full_path.exists():
+            return False
+        
+        full_path.unlink()
+        
+        # Delete metadata file if it exists
+        try:
+            full_path.with_suffix(full_path.suffix + '.meta').unlink()
+        except FileNotFoundError:
+            pass
+        
+        return True
+    
     async def exists(self, path: str) -> bool:
         """Check if item exists in local storage"""
         try:
-            full_path = self._get_full_path(path)
-            return full_path.exists()
+            return await asyncio.to_thread(self._exists_sync, path)
         except Exception as e:
             logger.error(f"Error checking existence in local storage: {str(e)}")
             return False
     
+    def _exists_sync(self, path: str) -> bool:
+        """Check for a stored file; runs in a worker thread"""
+        return self._get_full_path(path).exists()
+    
+    def open_file(self, path: str, mode: str = "rb") -> BinaryIO:
+        """Open a stored file in binary mode for streaming; blocking, so call it from a worker thread"""
+        return self._get_full_path(path).open(mode)
+    
     async def list(self, path: str = "", recursive: bool = False) -> List[StorageItem]:
         """List items in local storage"""
         try:
-            base_path = self._get_full_path(path)
-            
-            if not base_path.exists():
-                return []
-            
-            items = []
-            
-            if recursive:
-                pattern = "**/*"
-            else:
-                pattern = "*"
-            
-            for item_path in base_path.glob(pattern):
-                if item_path.name.endswith('.meta'):
-                    continue
+            cache_key = (path, recursive)
+            cached = self._list_cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                return list(cached[1])
+            
+            # A write finishing during the walk makes its result stale
+            generation = self._list_generation
+            items = await asyncio.to_thread(self._list_sync, path, recursive)
+            if generation == self._list_generation:
+                self._list_cache[cache_key] = (time.monotonic() + settings.storage_list_cache_ttl, items)
+            
+            return list(items)
+        except Exception as e:
+            logger.error(f"Error listing local storage: {str(e)}")
+            return []
+    
+    def _list_sync(self, path: str, recursive: bool) -> List[StorageItem]:
+        """Walk a storage directory; runs in a worker thread"""
+        base_path = self._get_full_path(path)
+        
+        if not base_path.exists():
+            return []
+        
+        items = []
+        
+        # One scandir per directory, walked with an explicit stack
+        relative_root = str(base_path.relative_to(self.base_path))
+        stack = [(str(base_path), "" if relative_root == "." else relative_root)]
+        while stack:
+            directory, relative_directory = stack.pop()
+            
+            # Sidecars are set aside in the same pass that reads the names;
+            # items then look theirs up by their own name
+            entries = []
+            sidecars = set()
+            with os.scandir(directory) as scanned:
+                for entry in scanned:
+                    name = entry.name
+                    if name.endswith('.meta'):
+                        sidecars.add(name[:-5])
+                    else:
+                        entries.append(entry)
+            
+            for entry in entries:
+                name = entry.name
+                relative_path = os.path.join(relative_directory, name)
                 
-                relative_path = item_path.relative_to(self.base_path)
+                item_stat, size, metadata = self._scan_entry(entry)
                 
-                # Load metadata if exists
-                metadata = {}
-                metadata_path = item_path.with_suffix(item_path.suffix + '.meta')
-                if metadata_path.exists():
-                    try:
-                        metadata = json.loads(metadata_path.read_text(encoding='utf-8'))
-                    except Exception:
-                        pass
+                # Plain files and directories keep their metadata in a sidecar
+                if metadata is None:
+                    metadata = {}
+                    if name in sidecars:
+                        try:
+                            with open(entry.path + '.meta', 'rb') as f:
+                                metadata = orjson.loads(f.read())
+                        except Exception:
+                            pass
                 
-                stat = item_path.stat()
+                is_directory = stat.S_ISDIR(item_stat.st_mode)
                 
                 items.append(StorageItem(
-                    path=str(relative_path),
-                    size=stat.st_size,
-                    last_modified=stat.st_mtime,
-                    is_directory=item_path.is_dir(),
+                    path=relative_path,
+                    size=size,
+                    last_modified=item_stat.st_mtime,
+                    is_directory=is_directory,
                     metadata=metadata
                 ))
-            
-            return sorted(items, key=lambda x: (not x.is_directory, x.path))
-            
-        except Exception as e:
-            logger.error(f"Error listing local storage: {str(e)}")
-            return []
+                
+                # Symlinked directories are listed but not descended into
+                if recursive and is_directory and not entry.is_symlink():
+                    stack.append((entry.path, relative_path))
+        
+        return sorted(items, key=lambda x: (not x.is_directory, x.path))
+    
+    @staticmethod
+    def _scan_entry(entry: os.DirEntry) -> Tuple[os.stat_result, int, Optional[Dict[str, Any]]]:
+        """Stat an entry and read its item header; metadata is None unless it is a saved item"""
+        if entry.is_dir():
+            item_stat = entry.stat()
+            return item_stat, item_stat.st_size, None
+        
+        try:
+            with open(entry.path, 'rb') as f:
+                item_stat = os.fstat(f.fileno())
+                parsed = _parse_item_header(f.read(_ITEM_HEADER.size))
+                if parsed is None:
+                    return item_stat, item_stat.st_size, None
+                
+                metadata_length = parsed[1]
+                size = item_stat.st_size - _ITEM_HEADER.size - metadata_length
+                if not metadata_length:
+                    return item_stat, size, {}
+                
+                try:
+                    return item_stat, size, orjson.loads(f.read(metadata_length))
+                except Exception:
+                    return item_stat, size, {}
+        except OSError:
+            # Unreadable files are listed from their stat alone
+            item_stat = entry.stat()
+            return item_stat, item_stat.st_size, None
     
     async def get_metadata(self, path: str) -> Optional[Dict[str, Any]]:
         """Get metadata for item"""
         try:
-            full_path = self._get_full_path(path)
-            metadata_path = full_path.with_suffix(full_path.suffix + '.meta')
-            
-            if metadata_path.exists():
-                return json.loads(metadata_path.read_text(encoding='utf-8'))
-            
-            return None
-            
+            return await asyncio.to_thread(self._get_metadata_sync, path)
         except Exception as e:
             logger.error(f"Error getting metadata from local storage: {str(e)}")
             return None
     
+    def _get_metadata_sync(self, path: str) -> Optional[Dict[str, Any]]:
+        """Read an item's metadata from its header, or from a sidecar; runs in a worker thread"""
+        full_path = self._get_full_path(path)
+        
+        try:
+            with open(full_path, 'rb') as f:
+                parsed = _parse_item_header(f.read(_ITEM_HEADER.size))
+                if parsed is not None:
+                    metadata_length = parsed[1]
+                    return orjson.loads(f.read(metadata_length)) if metadata_length else None
+        except (FileNotFoundError, IsADirectoryError):
+            pass
+        
+        metadata_path = full_path.with_suffix(full_path.suffix + '.meta')
+        if metadata_path.exists():
+            return orjson.loads(metadata_path.read_bytes())
+        
+        return None
+    
     async def set_metadata(self, path: str, metadata: Dict[str, Any]) -> bool:
         """Set metadata for item"""
         try:
-            full_path = self._get_full_path(path)
-            metadata_path = full_path.with_suffix(full_path.suffix + '.meta')
-            
-            metadata_path.write_text(json.dumps(metadata), encoding='utf-8')
+            try:
+                await asyncio.to_thread(self._set_metadata_sync, path, metadata)
+            finally:
+                self._invalidate_list_cache()
             return True
-            
         except Exception as e:
             logger.error(f"Error setting metadata in local storage: {str(e)}")
             return False
+    
+    def _set_metadata_sync(self, path: str, metadata: Dict[str, Any]):
+        """Store an item's metadata in its header, or in a sidecar for plain files; runs in a worker thread"""
+        full_path = self._get_full_path(path)
+        encoded = _dump_metadata(metadata)
+        
+        try:
+            with open(full_path, 'rb') as f:
+                parsed = _parse_item_header(f.read(_ITEM_HEADER.size))
+                if parsed is not None:
+                    flags, metadata_length = parsed
+                    f.seek(_ITEM_HEADER.size + metadata_length)
+                    content = f.read()
+                    item_mode = stat.S_IMODE(os.fstat(f.fileno()).st_mode)
+        except (FileNotFoundError, IsADirectoryError):
+            parsed = None
+        
+        # Plain files, directories and paths not saved yet are left untouched
+        if parsed is None:
+            full_path.with_suffix(full_path.suffix + '.meta').write_bytes(encoded)
+            return
+        
+        # Write the new item beside the old one and swap it in, so a crash
+        # mid-write leaves the previous file intact
+        header = _ITEM_HEADER.pack(_ITEM_MAGIC, _ITEM_VERSION, flags, 0, len(encoded))
+        fd, temp_path = tempfile.mkstemp(dir=full_path.parent, prefix=f".{full_path.name}.", suffix=".tmp")
+        try:
+            # mkstemp creates the file private; keep the item's permissions
+            os.fchmod(fd, item_mode)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header + encoded + content)
+            os.replace(temp_path, full_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
 
 class CloudStorage(StorageInterface):
     """Cloud storage implementation (placeholder for future implementation)"""
@@ -328,39 +594,64 @@ class StorageManager:
             raise Exception("Storage not initialized")
         return await self.storage.set_metadata(path, metadata)
     
+    async def load_many(self, paths: List[str]) -> List[Optional[Union[str, bytes]]]:
+        """Load several items using configured storage"""
+        if not self.storage:
+            raise Exception("Storage not initialized")
+        return await self.storage.load_many(paths)
+    
+    async def save_many(self, items: List[Tuple[str, Union[str, bytes], Optional[Dict[str, Any]]]]) -> List[bool]:
+        """Save several items using configured storage"""
+        if not self.storage:
+            raise Exception("Storage not initialized")
+        return await self.storage.save_many(items)
+    
     async def backup_data(self, backup_path: str) -> Dict[str, Any]:
         """Create backup of storage data"""
         try:
             # Get all items
             all_items = await self.list(recursive=True)
-            
-            backup_data = {
-                "storage_type": self.storage_type,
-                "timestamp": asyncio.get_event_loop().time(),
-                "items": []
-            }
-            
-            # Backup each item
-            for item in all_items:
-                if not item.is_directory:
-                    content = await self.load(item.path)
-                    if content is not None:
-                        backup_data["items"].append({
-                            "path": item.path,
-                            "content": content if isinstance(content, str) else content.hex(),
-                            "is_binary": isinstance(content, bytes),
-                            "metadata": item.metadata
-                        })
-            
-            # Save backup
-            backup_manager = StorageManager("local")
-            await backup_manager.save(backup_path, json.dumps(backup_data, indent=2))
-            
-            logger.info(f"Created backup with {len(backup_data['items'])} items")
+            files = [item for item in all_items if not item.is_directory]
+            batch_size = settings.storage_io_batch_size
+            
+            # The backup is a header line followed by one JSON line per item,
+            # written as batches arrive so only the batches in flight are in memory
+            backup_file = await asyncio.to_thread(LocalStorage().open_file, backup_path, "wb")
+            pending: Deque[Tuple[List[StorageItem], asyncio.Task]] = deque()
+            items_backed_up = 0
+            try:
+                header = {
+                    "storage_type": self.storage_type,
+                    "timestamp": asyncio.get_event_loop().time()
+                }
+                await asyncio.to_thread(backup_file.write, orjson.dumps(header) + b"\n")
+                
+                for start in range(0, len(files), batch_size):
+                    batch = files[start:start + batch_size]
+                    pending.append((batch, asyncio.create_task(self.load_many([item.path for item in batch]))))
+                    
+                    # Batches are written in order with a bounded number in flight
+                    if len(pending) >= settings.storage_io_concurrency:
+                        batch, task = pending.popleft()
+                        items_backed_up += await asyncio.to_thread(
+                            self._write_backup_items, backup_file, batch, await task
+                        )
+                
+                while pending:
+                    batch, task = pending.popleft()
+                    items_backed_up += await asyncio.to_thread(
+                        self._write_backup_items, backup_file, batch, await task
+                    )
+            finally:
+                for _, task in pending:
+                    task.cancel()
+                await asyncio.to_thread(backup_file.close)
+            
+            logger.info(f"Created backup with {items_backed_up} items")
             
             return {
                 "backup_path": backup_path,
-                "items_backed_up": len(backup_data["items"]),
+                "items_backed_up": items_backed_up,
                 "status": "success"
             }
             
@@ -368,33 +659,60 @@ class StorageManager:
             logger.error(f"Error creating backup: {str(e)}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _write_backup_items(
+        backup_file: BinaryIO,
+        batch: List[StorageItem],
+        contents: List[Optional[Union[str, bytes]]]
+    ) -> int:
+        """Write one backup line per loaded item; runs in a worker thread"""
+        lines = []
+        for item, content in zip(batch, contents):
+            if content is None:
+                continue
+            
+            item_data = {"path": item.path, "content": content, "is_binary": False, "metadata": item.metadata}
+            if isinstance(content, bytes):
+                item_data["content"] = base64.b64encode(content).decode('ascii')
+                item_data["is_binary"] = True
+                item_data["encoding"] = "base64"
+            
+            lines.append(orjson.dumps(item_data, option=orjson.OPT_NON_STR_KEYS) + b"\n")
+        
+        backup_file.writelines(lines)
+        return len(lines)
+    
     async def restore_data(self, backup_path: str) -> Dict[str, Any]:
         """Restore data from backup"""
         try:
             # Load backup
-            backup_manager = StorageManager("local")
-            backup_content = await backup_manager.load(backup_path)
+            backup_file = await asyncio.to_thread(self._open_backup, backup_path)
             
-            if not backup_content:
+            if backup_file is None:
                 return {"error": "Backup file not found or empty"}
             
-            backup_data = json.loads(backup_content)
-            
-            # Restore items
+            # Items are read and saved in batches with a bounded number in flight
+            pending: Deque[asyncio.Task] = deque()
             restored_count = 0
-            for item_data in backup_data["items"]:
-                content = item_data["content"]
-                if item_data["is_binary"]:
-                    content = bytes.fromhex(content)
+            try:
+                backup_items = self._iter_backup_items(backup_file)
+                batch_size = settings.storage_io_batch_size
                 
-                success = await self.save(
-                    item_data["path"],
-                    content,
-                    item_data["metadata"]
-                )
+                while True:
+                    batch = await asyncio.to_thread(list, islice(backup_items, batch_size))
+                    if not batch:
+                        break
+                    
+                    pending.append(asyncio.create_task(self.save_many(batch)))
+                    if len(pending) >= settings.storage_io_concurrency:
+                        restored_count += sum(await pending.popleft())
                 
-                if success:
-                    restored_count += 1
+                while pending:
+                    restored_count += sum(await pending.popleft())
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.to_thread(backup_file.close)
             
             logger.info(f"Restored {restored_count} items from backup")
             
@@ -408,21 +726,60 @@ class StorageManager:
             logger.error(f"Error restoring from backup: {str(e)}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _open_backup(backup_path: str) -> Optional[BinaryIO]:
+        """Open a backup file for reading, or return None if it is missing or empty"""
+        try:
+            backup_file = LocalStorage().open_file(backup_path, "rb")
+        except FileNotFoundError:
+            return None
+        
+        if not backup_file.read(1):
+            backup_file.close()
+            return None
+        
+        backup_file.seek(0)
+        return backup_file
+    
+    @staticmethod
+    def _iter_backup_items(backup_file: BinaryIO) -> Iterator[Tuple[str, Union[str, bytes], Optional[Dict[str, Any]]]]:
+        """Yield (path, content, metadata) for each backed up item; iterated in worker threads"""
+        try:
+            # The first line is the header
+            orjson.loads(backup_file.readline())
+            items = (orjson.loads(line) for line in backup_file if line.strip())
+        except ValueError:
+            # Backups written before the line-per-item format are one JSON document
+            backup_file.seek(0)
+            items = iter(orjson.loads(backup_file.read())["items"])
+        
+        for item_data in items:
+            content = item_data["content"]
+            if item_data["is_binary"]:
+                # Older backups hex-encode binary content
+                if item_data.get("encoding") == "base64":
+                    content = base64.b64decode(content)
+                else:
+                    content = bytes.fromhex(content)
+            yield item_data["path"], content, item_data["metadata"]
+    
     async def get_storage_stats(self) -> Dict[str, Any]:
         """Get storage statistics"""
         try:
             all_items = await self.list(recursive=True)
             
-            total_files = sum(1 for item in all_items if not item.is_directory)
-            total_directories = sum(1 for item in all_items if item.is_directory)
-            total_size = sum(item.size for item in all_items if not item.is_directory)
-            
-            # File type analysis
-            file_types = {}
-            for item in all_items:
-                if not item.is_directory:
-                    ext = Path(item.path).suffix.lower()
-                    file_types[ext] = file_types.get(ext, 0) + 1
+            files = [item for item in all_items if not item.is_directory]
+            total_files = len(files)
+            total_directories = len(all_items) - total_files
+            total_size = sum(item.size for item in files)
+            
+            # File type analysis; splitext yields "." for names ending in a dot,
+            # which Path.suffix reports as no suffix
+            extensions = Counter(os.path.splitext(item.path)[1] for item in files)
+            file_types: Dict[str, int] = {}
+            for ext, count in extensions.items():
+                ext = "" if ext == "." else ext.lower()
+                file_types[ext] = file_types.get(ext, 0) + count
             
             return {
                 "storage_type": self.storage_type,
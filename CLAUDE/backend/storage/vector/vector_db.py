@@ -10,6 +10,8 @@ from pathlib import Path
 import asyncio
 from dataclasses import dataclass
 
+import orjson
+
 try:
     import chromadb
     from chromadb.config import Settings
@@ -61,6 +63,16 @@ class VectorDatabaseManager:
         logger.info(f"Vector database initialized at {self.db_path}")
         logger.info(f"Using embedding model: {self.embedding_model_name}")
     
+    def warmup(self):
+        """Run a dry embedding and query so the first request doesn't pay for lazy initialization"""
+        query_embedding = self.embed_query("warmup")
+        if self.collection.count() > 0:
+            self.collection.query(query_embeddings=[query_embedding], n_results=1)
+    
+    def embed_query(self, query: str) -> List[float]:
+        """Generate embedding for a single query text"""
+        return self.embedding_model.encode([query]).tolist()[0]
+    
     async def add_documents(
         self,
         documents: List[str],
@@ -72,14 +84,15 @@ class VectorDatabaseManager:
             if len(documents) != len(metadatas) or len(documents) != len(ids):
                 raise ValueError("Documents, metadatas, and ids must have the same length")
             
-            # Generate embeddings
+            # Generate embeddings off the event loop so concurrent batches can overlap
             logger.info(f"Generating embeddings for {len(documents)} documents")
-            embeddings = self.embedding_model.encode(documents).tolist()
+            embeddings = await asyncio.to_thread(self.embedding_model.encode, documents, batch_size=64)
             
             # Add to collection
-            self.collection.add(
+            await asyncio.to_thread(
+                self.collection.add,
                 documents=documents,
-                embeddings=embeddings,
+                embeddings=embeddings.tolist(),
                 metadatas=metadatas,
                 ids=ids
             )
@@ -100,12 +113,14 @@ class VectorDatabaseManager:
         self,
         query: str,
         k: int = 5,
-        threshold: float = 0.3
+        threshold: float = 0.3,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar documents"""
+        """Search for similar documents, returning them by descending score"""
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode([query]).tolist()[0]
+            # Generate query embedding unless precomputed
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
             
             # Perform similarity search
             results = self.collection.query(
@@ -129,8 +144,8 @@ class VectorDatabaseManager:
                         "id": results["ids"][0][i]
                     })
             
-            # Sort by score
-            search_results.sort(key=lambda x: x["score"], reverse=True)
+            # Chroma returns nearest neighbours first; scores fall as distances grow,
+            # so the results are already ranked
             
             logger.info(f"Found {len(search_results)} results for query: {query[:50]}...")
             
@@ -309,12 +324,11 @@ class VectorDatabaseManager:
             all_docs = await self.get_all_documents(limit=10000)
             
             # Save to file
-            import json
             backup_file = Path(backup_path) / "vector_db_backup.json"
             backup_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(backup_file, 'w') as f:
-                json.dump(all_docs, f, indent=2)
+            with open(backup_file, 'wb') as f:
+                f.write(orjson.dumps(all_docs, option=orjson.OPT_INDENT_2))
             
             logger.info(f"Created backup with {len(all_docs)} documents at {backup_file}")
             
@@ -332,11 +346,10 @@ class VectorDatabaseManager:
         """Restore collection from backup"""
         try:
             # Load backup
-            import json
             backup_file = Path(backup_path) / "vector_db_backup.json"
             
-            with open(backup_file, 'r') as f:
-                backup_data = json.load(f)
+            with open(backup_file, 'rb') as f:
+                backup_data = orjson.loads(f.read())
             
             # Clear current collection
             await self.clear_collection()
@@ -0,0 +1,71 @@
+"""
+Tests for the local storage item format
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.storage.storage_manager import LocalStorage, _ITEM_MAGIC
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_item_round_trip(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    
+    assert run(storage.save("a.txt", "line one\nline two", {"k": 1}))
+    assert run(storage.save("b.bin", b"\x00\xffdata", {"kind": "binary"}))
+    
+    assert (tmp_path / "a.txt").read_bytes().startswith(_ITEM_MAGIC)
+    assert not (tmp_path / "a.txt.meta").exists()
+    
+    assert run(storage.load("a.txt")) == "line one\nline two"
+    assert run(storage.load("b.bin")) == b"\x00\xffdata"
+    assert run(storage.get_metadata("a.txt")) == {"k": 1}
+    assert run(storage.get_metadata("b.bin")) == {"kind": "binary"}
+    
+    items = {item.path: item for item in run(storage.list())}
+    assert items["a.txt"].size == len("line one\nline two")
+    assert items["a.txt"].metadata == {"k": 1}
+    assert items["b.bin"].metadata == {"kind": "binary"}
+
+def test_save_without_metadata_keeps_metadata(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    
+    run(storage.save("a.txt", "hello", {"k": 1}))
+    run(storage.save("a.txt", "hello2"))
+    
+    assert run(storage.load("a.txt")) == "hello2"
+    assert run(storage.get_metadata("a.txt")) == {"k": 1}
+
+def test_set_metadata_rewrites_header(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    
+    run(storage.save("a.txt", "hello", {"k": 1}))
+    assert run(storage.set_metadata("a.txt", {"k": 2}))
+    
+    assert run(storage.load("a.txt")) == "hello"
+    assert run(storage.get_metadata("a.txt")) == {"k": 2}
+    assert not (tmp_path / "a.txt.meta").exists()
+
+def test_plain_file_with_sidecar(tmp_path):
+    (tmp_path / "legacy.txt").write_bytes(b"x\r\ny")
+    (tmp_path / "legacy.txt.meta").write_bytes(b'{"k": 1}')
+    storage = LocalStorage(str(tmp_path))
+    
+    assert run(storage.load("legacy.txt")) == "x\ny"
+    assert run(storage.get_metadata("legacy.txt")) == {"k": 1}
+    
+    # set_metadata leaves plain files as they are
+    run(storage.set_metadata("legacy.txt", {"k": 2}))
+    assert (tmp_path / "legacy.txt").read_bytes() == b"x\r\ny"
+    assert run(storage.get_metadata("legacy.txt")) == {"k": 2}
+    
+    # Re-saving moves the sidecar's metadata into the header
+    run(storage.save("legacy.txt", "new"))
+    assert not (tmp_path / "legacy.txt.meta").exists()
+    assert run(storage.get_metadata("legacy.txt")) == {"k": 2}
+    assert [item.path for item in run(storage.list())] == ["legacy.txt"]
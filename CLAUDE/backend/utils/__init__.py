@@ -7,6 +7,7 @@ Provides helper functions and utilities for the CLAUDE backend.
 from .helpers import (
     setup_logging,
     ensure_directory_exists,
+    ensure_directories_exist,
     calculate_file_hash,
     get_file_size,
     format_file_size,
@@ -29,6 +30,7 @@ from .helpers import (
 __all__ = [
     "setup_logging",
     "ensure_directory_exists",
+    "ensure_directories_exist",
     "calculate_file_hash",
     "get_file_size",
     "format_file_size",
@@ -5,7 +5,7 @@ Utility functions for CLAUDE backend
 import os
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 from pathlib import Path
 import hashlib
 import time
@@ -30,6 +30,13 @@ def ensure_directory_exists(path: str):
     """Ensure directory exists, create if not"""
     Path(path).mkdir(parents=True, exist_ok=True)
 
+def ensure_directories_exist(paths: Iterable[str]):
+    """Ensure several directories exist, only creating those that are missing"""
+    for path in paths:
+        directory = Path(path)
+        if not directory.is_dir():
+            directory.mkdir(parents=True, exist_ok=True)
+
 def calculate_file_hash(file_path: str) -> str:
     """Calculate SHA256 hash of a file"""
     hash_sha256 = hashlib.sha256()